@@ -1,9 +1,10 @@
 print("Running Nexus Hub app.py version 2025-06-12")
 import os
 import requests
-from flask import Flask, request, render_template, redirect, url_for, send_from_directory, session, flash
+from flask import Flask, Request, request, render_template, redirect, url_for, send_from_directory, session, flash, make_response, jsonify, Response, stream_with_context, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
-from flask_socketio import SocketIO, emit
+from sqlalchemy.orm import selectinload
+from flask_socketio import SocketIO, emit, join_room
 from werkzeug.utils import secure_filename
 from datetime import datetime, timezone, timedelta
 from flask_wtf import FlaskForm
@@ -12,6 +13,7 @@ from wtforms.validators import DataRequired, Email, Length
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import bcrypt
+import click
 import bleach
 from dotenv import load_dotenv
 import logging
@@ -21,6 +23,31 @@ from apscheduler.triggers.interval import IntervalTrigger
 import atexit
 import time
 import urllib.parse
+import hashlib
+import mimetypes
+from functools import lru_cache, wraps
+import socket
+import threading
+import uuid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import or_, event
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+from werkzeug.middleware.proxy_fix import ProxyFix
+from migrations import run_migrations
+from page_cache import PageCache, SharedGeneration
+from uploads import HashingSpool, store_upload, blob_name
+from outbound import OutboundClient, SendQueue
+from backpressure import ConcurrencyLimit
+from search_index import SearchIndex, extract_text
+from timetable import parse_timetable, normalize_unit
+from zoneinfo import ZoneInfo
+from bulk import (BulkError, read_frame, validate_units, validate_assignments, stream_csv, stream_json,
+                  UNIT_FIELDS, ASSIGNMENT_FIELDS)
+import hmac
+from metrics import Registry, SlowRequestProfiler
 
 # Load environment variables
 load_dotenv()
@@ -35,21 +62,168 @@ app.config['SESSION_COOKIE_SECURE'] = True  # Disabled for local testing
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(minutes=30)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB file size limit
+app.config['UPLOAD_CHUNK_SIZE'] = 1024 * 1024  # Bytes copied to disk per chunk
 app.config['TELEGRAM_BOT_TOKEN'] = os.environ.get('TELEGRAM_BOT_TOKEN', 'token')
 app.config['TELEGRAM_CHAT_ID'] = os.environ.get('TELEGRAM_CHAT_ID', 'Id')
 app.config['NEWS_API_KEY'] = os.environ.get('NEWS_API_KEY', 'api')
+app.config['TELEGRAM_API_BASE'] = os.environ.get('TELEGRAM_API_BASE', 'https://api.telegram.org')
+app.config['NEWS_API_BASE'] = os.environ.get('NEWS_API_BASE', 'https://newsapi.org')
+app.config['OUTBOUND_POOL_SIZE'] = int(os.environ.get('OUTBOUND_POOL_SIZE', 10))
+app.config['OUTBOUND_RETRIES'] = int(os.environ.get('OUTBOUND_RETRIES', 3))
+app.config['OUTBOUND_PER_HOST_LIMIT'] = int(os.environ.get('OUTBOUND_PER_HOST_LIMIT', 4))
+app.config['NEWS_MAX_AGE'] = int(os.environ.get('NEWS_MAX_AGE', 30 * 60))  # Seconds before news counts as stale
+app.config['NEWS_RETRY_INTERVAL'] = int(os.environ.get('NEWS_RETRY_INTERVAL', 5 * 60))  # Seconds to wait after a failed fetch
+app.config['SCHEDULER_LOCK_TTL'] = int(os.environ.get('SCHEDULER_LOCK_TTL', 90))  # Seconds a dead leader keeps the lock
+app.config['SOCKETIO_MESSAGE_QUEUE'] = os.environ.get('SOCKETIO_MESSAGE_QUEUE')  # e.g. redis://host:6379/0; unset = in-process
+app.config['SEARCH_WORKERS'] = int(os.environ.get('SEARCH_WORKERS', 2))  # Text extraction processes; 0 = in-thread
+app.config['SEARCH_BATCH_SIZE'] = int(os.environ.get('SEARCH_BATCH_SIZE', 200))
+app.config['OUTBOUND_QUEUE_SIZE'] = int(os.environ.get('OUTBOUND_QUEUE_SIZE', 100))
 app.config['UNIT_DELETE_SECRET_KEY'] = os.environ.get('UNIT_DELETE_SECRET_KEY', 'key')
+app.config['BULK_IMPORT_SECRET_KEY'] = os.environ.get('BULK_IMPORT_SECRET_KEY', app.config['UNIT_DELETE_SECRET_KEY'])
+app.config['BULK_IMPORT_MAX_ERRORS'] = int(os.environ.get('BULK_IMPORT_MAX_ERRORS', 1000))  # Row errors listed per response
 app.config['ACTIVATION_LINK'] = os.environ.get('ACTIVATION_LINK', 'irm https://get.activated.win | iex')
+app.config['SENDFILE_MODE'] = os.environ.get('SENDFILE_MODE', '')  # '', 'x-sendfile' or 'x-accel'
+app.config['USE_X_SENDFILE'] = app.config['SENDFILE_MODE'] == 'x-sendfile'
+app.config['X_ACCEL_UPLOADS_LOCATION'] = os.environ.get('X_ACCEL_UPLOADS_LOCATION', '/_protected/Uploads')
+app.config['X_ACCEL_OUTPUTS_LOCATION'] = os.environ.get('X_ACCEL_OUTPUTS_LOCATION', '/_protected/outputs')
+app.config['DASHBOARD_CACHE_TTL'] = int(os.environ.get('DASHBOARD_CACHE_TTL', 300))
+app.config['DASHBOARD_CACHE_SHARED'] = os.environ.get('DASHBOARD_CACHE_SHARED', str(int(os.environ.get('WEB_CONCURRENCY', 1)) > 1)).lower() not in ('0', 'false', 'no')  # Follow other processes' invalidations; on with several workers, set it for several machines
+app.config['DASHBOARD_CACHE_SYNC_SECONDS'] = float(os.environ.get('DASHBOARD_CACHE_SYNC_SECONDS', 1))  # How late another process's invalidation may be seen
+app.config['TIMETABLE_TIMEZONE'] = os.environ.get('TIMETABLE_TIMEZONE', 'Africa/Nairobi')  # Zone the timetables are written in
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')  # Bearer token for /metrics; unset = open
+app.config['PROFILE_SLOW_REQUEST_MS'] = int(os.environ.get('PROFILE_SLOW_REQUEST_MS', 0))  # 0 = profiler off
+app.config['PROFILE_INTERVAL_MS'] = int(os.environ.get('PROFILE_INTERVAL_MS', 5))
+app.config['PROFILE_FOLDER'] = os.environ.get('PROFILE_FOLDER', 'app/profiles')
+app.config['PROXY_FIX_X_FOR'] = int(os.environ.get('PROXY_FIX_X_FOR', 0))  # Proxies in front that append X-Forwarded-For; 1 on Fly.io
+app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+app.config['RATELIMIT_STORAGE_URI'] = os.environ.get('RATELIMIT_STORAGE_URI', 'memory://')  # e.g. redis://host:6379/1 to share counts between workers
+app.config['UPLOAD_RATE_LIMIT'] = os.environ.get('UPLOAD_RATE_LIMIT', '30 per minute')  # Per client IP, notes, timetables and bulk files
+app.config['WRITE_RATE_LIMIT'] = os.environ.get('WRITE_RATE_LIMIT', '60 per minute')  # Per client IP, assignments and unit setup
+app.config['SECRET_KEY_RATE_LIMIT'] = os.environ.get('SECRET_KEY_RATE_LIMIT', '10 per minute;100 per day')  # Per client IP, unit deletes and bulk imports
+app.config['TELEGRAM_RATE_LIMIT'] = os.environ.get('TELEGRAM_RATE_LIMIT', '10 per minute;200 per day')  # Per client IP
+app.config['MAX_CONCURRENT_UPLOADS'] = int(os.environ.get('MAX_CONCURRENT_UPLOADS', 4))  # Multipart bodies read at once per worker
+app.config['UPLOAD_QUEUE_SIZE'] = int(os.environ.get('UPLOAD_QUEUE_SIZE', 8))  # Uploads that may wait for a slot; the rest get 503
+app.config['UPLOAD_QUEUE_TIMEOUT'] = float(os.environ.get('UPLOAD_QUEUE_TIMEOUT', 5))  # Seconds an upload waits for a slot
+app.config['RETRY_AFTER_SECONDS'] = int(os.environ.get('RETRY_AFTER_SECONDS', 5))  # Sent with 503s from full queues
 
 db = SQLAlchemy(app)
-socketio = SocketIO(app, cors_allowed_origins=['http://localhost:5100', 'http://127.0.0.1:5100', 'http://0.0.0.0:5100', 'https://nexus-hub.fly.dev'])
+socketio = SocketIO(app, message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'], cors_allowed_origins=['http://localhost:5100', 'http://127.0.0.1:5100', 'http://0.0.0.0:5100', 'https://nexus-hub.fly.dev'])
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global cache for tech news
-tech_news_cache = []
+# Metrics served on /metrics
+metrics = Registry()
+REQUEST_LATENCY = metrics.histogram('nexushub_http_request_duration_seconds', 'Time spent handling a request.',
+                                    ['method', 'route', 'status'])
+REQUESTS_IN_FLIGHT = metrics.gauge('nexushub_http_requests_in_flight', 'Requests being handled right now.')
+REQUEST_DB_QUERIES = metrics.histogram('nexushub_request_db_queries', 'SQL statements run per request.',
+                                       ['route'], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100))
+REQUEST_DB_SECONDS = metrics.histogram('nexushub_request_db_seconds', 'Time spent in SQL per request.', ['route'])
+DB_QUERIES = metrics.counter('nexushub_db_queries_total', 'SQL statements run, in or out of requests.')
+DB_QUERY_SECONDS = metrics.counter('nexushub_db_query_seconds_total', 'Time spent in SQL, in or out of requests.')
+OUTBOUND_LATENCY = metrics.histogram('nexushub_outbound_request_duration_seconds', 'Outbound HTTP calls, retries included.',
+                                     ['method', 'host', 'status'])
+UPLOAD_BYTES = metrics.counter('nexushub_upload_bytes_total', 'Bytes written by uploads.')
+UPLOAD_THROUGHPUT = metrics.histogram('nexushub_upload_bytes_per_second', 'Write rate of each upload.', [],
+                                      buckets=(2 ** 16, 2 ** 18, 2 ** 20, 2 ** 22, 2 ** 24, 2 ** 26, 2 ** 28))
+JOB_DURATION = metrics.histogram('nexushub_scheduler_job_duration_seconds', 'Scheduled job run time.', ['job'],
+                                 buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 15, 30, 60, 300))
+JOB_FAILURES = metrics.counter('nexushub_scheduler_job_failures_total', 'Scheduled job runs that raised.', ['job'])
+SOCKET_CONNECTIONS = metrics.gauge('nexushub_socketio_connections', 'Socket.IO clients connected to this process.')
+SOCKET_CONNECTS = metrics.counter('nexushub_socketio_connects_total', 'Socket.IO connections accepted.')
+SHED_REQUESTS = metrics.counter('nexushub_shed_requests_total', 'Requests refused by a rate limit or a full queue.', ['reason'])
+UPLOAD_SLOTS = metrics.gauge('nexushub_upload_slots', 'Uploads being read or waiting for a slot.', ['state'])
+profiler = SlowRequestProfiler(app.config['PROFILE_FOLDER'], app.config['PROFILE_SLOW_REQUEST_MS'] / 1000,
+                               interval_seconds=app.config['PROFILE_INTERVAL_MS'] / 1000)
+
+def observe_outbound(method, host, status, seconds):
+    OUTBOUND_LATENCY.observe(seconds, method=method, host=host, status=status)
+
+# Pooled client and background queue for Telegram/NewsAPI calls
+http_client = OutboundClient(pool_size=app.config['OUTBOUND_POOL_SIZE'],
+                             retries=app.config['OUTBOUND_RETRIES'],
+                             per_host_limit=app.config['OUTBOUND_PER_HOST_LIMIT'],
+                             observer=observe_outbound)
+send_queue = SendQueue(maxsize=app.config['OUTBOUND_QUEUE_SIZE'])
+
+# Identifies this process when it holds a JobLock
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Request timing
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.profile_started = time.monotonic()
+    g.db_queries = 0
+    g.db_seconds = 0.0
+    REQUESTS_IN_FLIGHT.inc()
+
+@app.after_request
+def record_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+@app.teardown_request
+def record_request_metrics(exc):
+    if 'request_started' not in g:
+        return
+    REQUESTS_IN_FLIGHT.dec()
+    duration = time.perf_counter() - g.request_started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUEST_LATENCY.observe(duration, method=request.method, route=route, status=g.get('response_status', 500))
+    REQUEST_DB_QUERIES.observe(g.db_queries, route=route)
+    REQUEST_DB_SECONDS.observe(g.db_seconds, route=route)
+    if profiler.enabled:
+        path = profiler.dump(f'{request.method} {request.path}', g.profile_started, duration)
+        if path:
+            logger.warning(f"Slow request {request.method} {request.path} took {duration * 1000:.0f}ms, profile in {path}")
+
+# Rate limiting and load shedding
+# Limits are counted per client IP in RATELIMIT_STORAGE_URI. Behind a proxy,
+# set PROXY_FIX_X_FOR so that IP comes from X-Forwarded-For rather than
+# being the proxy's own address for every client.
+if app.config['PROXY_FIX_X_FOR']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+limiter = Limiter(get_remote_address, app=app)
+upload_slots = ConcurrencyLimit(app.config['MAX_CONCURRENT_UPLOADS'], queue_size=app.config['UPLOAD_QUEUE_SIZE'],
+                                timeout=app.config['UPLOAD_QUEUE_TIMEOUT'])
+
+def is_upload():
+    # Decided from the headers so a refused upload is never read off the socket.
+    return request.method == 'POST' and request.mimetype == 'multipart/form-data'
+
+def is_form_post(field):
+    return request.method == 'POST' and not is_upload() and field in request.form
+
+def shed(reason, message, status=503, retry_after=None):
+    SHED_REQUESTS.inc(reason=reason)
+    response = jsonify(error=message)
+    response.status_code = status
+    response.headers['Retry-After'] = str(retry_after or app.config['RETRY_AFTER_SECONDS'])
+    return response
+
+@app.errorhandler(429)
+def rate_limited(e):
+    logger.warning(f"Rate limit {e.description} hit by {get_remote_address()} on {request.method} {request.path}")
+    current = limiter.current_limit
+    retry_after = max(1, int(current.reset_at - time.time())) if current else None
+    return shed('rate_limit', f'Too many requests, limit is {e.description}', 429, retry_after)
+
+@app.before_request
+def claim_upload_slot():
+    if not is_upload():
+        return None
+    if not upload_slots.acquire():
+        logger.warning(f"Upload refused, {upload_slots.capacity} in progress and the queue is full")
+        return shed('upload_slots', 'Too many uploads in progress, try again shortly')
+    g.upload_slot = True
+
+@app.teardown_request
+def release_upload_slot(exc):
+    if g.pop('upload_slot', False):
+        upload_slots.release()
 
 # Secure headers
 @app.after_request
@@ -59,10 +233,6 @@ def add_security_headers(response):
     response.headers['Content-Security-Policy'] = "default-src 'self'; script-src 'self' http://localhost:5100 https://cdn.socket.io https://nexus-hub.fly.dev; style-src 'self' 'unsafe-inline'; connect-src 'self' ws://localhost:5100 wss://localhost:5100 ws://nexus-hub.fly.dev wss://nexus-hub.fly.dev;"
     return response
 
-# Ensure upload/output folders exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
-
 # Database Models
 class Unit(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -75,16 +245,62 @@ class Unit(db.Model):
 class File(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(100), nullable=False)
-    type = db.Column(db.String(20), nullable=False)
-    upload_date = db.Column(db.String(20), default=lambda: datetime.now(timezone.utc).strftime('%d/%m/%Y'))
-    unit_id = db.Column(db.Integer, db.ForeignKey('unit.id'), nullable=True)
+    type = db.Column(db.String(20), nullable=False, index=True)
+    upload_date = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    unit_id = db.Column(db.Integer, db.ForeignKey('unit.id'), nullable=True, index=True)
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+    size = db.Column(db.Integer, nullable=True)
+
+    @property
+    def stored_name(self):
+        """Name of the blob on disk; rows from before content addressing use the upload name."""
+        return stored_name_of(self)
 
 class Assignment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     topic = db.Column(db.String(100), nullable=False)
     remark = db.Column(db.String(200), nullable=False)
-    due_date = db.Column(db.String(20), nullable=False)
-    posted_date = db.Column(db.String(20), default=lambda: datetime.now(timezone.utc).strftime('%d/%m/%Y'))
+    due_date = db.Column(db.Date, nullable=False, index=True)
+    posted_date = db.Column(db.Date, default=lambda: datetime.now(timezone.utc).date())
+
+class TimetableSession(db.Model):
+    """One parsed timetable slot. Rows with a session_date happen once (exams);
+    rows without one repeat every week on `day` (0 = Monday)."""
+    id = db.Column(db.Integer, primary_key=True)
+    timetable_type = db.Column(db.String(20), nullable=False)
+    file_id = db.Column(db.Integer, nullable=False)
+    content_hash = db.Column(db.String(64), nullable=True)
+    unit = db.Column(db.String(100), nullable=False)
+    unit_key = db.Column(db.String(100), nullable=False, index=True)
+    day = db.Column(db.Integer, nullable=True)
+    session_date = db.Column(db.Date, nullable=True, index=True)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=True)
+    venue = db.Column(db.String(100), nullable=True)
+    __table_args__ = (db.Index('ix_timetable_session_type_day_start', 'timetable_type', 'day', 'start_time'),)
+
+class NewsCache(db.Model):
+    key = db.Column(db.String(50), primary_key=True)
+    articles = db.Column(db.JSON, nullable=False, default=list)
+    fetched_at = db.Column(db.DateTime, nullable=True)
+    attempted_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.String(200), nullable=True)
+
+class CacheGeneration(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    changed_at = db.Column(db.DateTime, nullable=False)
+
+class TelegramStatus(db.Model):
+    job_id = db.Column(db.String(32), primary_key=True)
+    status = db.Column(db.String(20), nullable=False)
+    error = db.Column(db.String(200), nullable=True)
+    reported_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class JobLock(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(100), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
 
 class Admin(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -105,10 +321,34 @@ class TelegramLinkForm(FlaskForm):
     link = StringField('Link', validators=[DataRequired()])
     submit = SubmitField('Send to Telegram')
 
+# Upload spooling
+class UploadRequest(Request):
+    """Spool multipart file parts straight into UPLOAD_FOLDER, hashing as they
+    arrive, so save_upload() only has to rename them: each upload is written to
+    disk once. Parts that are not saved are deleted when the request closes."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        return HashingSpool(app.config['UPLOAD_FOLDER'])
+
+app.request_class = UploadRequest
+
 # File validation
 def allowed_file(filename):
     return filename.lower().endswith(('.xlsx', '.csv', '.docx', '.pdf', '.xls'))
 
+def save_upload(file, filename):
+    if isinstance(file.stream, HashingSpool):
+        # Already on disk and hashed by UploadRequest while the body was parsed.
+        stored_name, content_hash, size = file.stream.commit(app.config['UPLOAD_FOLDER'], filename)
+    else:
+        stored_name, content_hash, size = store_upload(file.stream, app.config['UPLOAD_FOLDER'], filename,
+                                                       chunk_size=app.config['UPLOAD_CHUNK_SIZE'],
+                                                       yield_fn=lambda: socketio.sleep(0))
+    UPLOAD_BYTES.inc(size)
+    UPLOAD_THROUGHPUT.observe(size / max(time.perf_counter() - g.get('request_started', time.perf_counter()), 1e-6))
+    return stored_name, content_hash, size
+
 def sanitize_input(text):
     return bleach.clean(text, tags=[], attributes={})
 
@@ -124,19 +364,199 @@ def validate_email(email):
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return bool(re.match(pattern, email))
 
-# Fetch tech news
+# Assignment expiry
+def purge_expired_assignments():
+    """Delete every assignment whose due date has passed in one bulk DELETE.
+
+    Runs from the scheduler so GET / never writes; the page hides expired rows
+    itself in the meantime.
+    """
+    with app.app_context():
+        try:
+            today = datetime.now(timezone.utc).date()
+            purged = Assignment.query.filter(Assignment.due_date < today).delete(synchronize_session=False)
+            db.session.commit()
+            if purged:
+                dashboard_cache.invalidate()
+                broadcast('assignment_expired', {'due_before': today.strftime('%d/%m/%Y')})
+            logger.info(f"Purged {purged} expired assignments")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error purging expired assignments: {str(e)}")
+
+# Dashboard data
+def load_dashboard():
+    """Load everything the index page renders in a fixed number of queries.
+
+    Units come back with their notes eager-loaded (one extra SELECT ... IN for
+    all units), both timetables share one query and assignments one more, so
+    the page costs four round-trips no matter how many units or notes exist.
+    """
+    units = Unit.query.options(selectinload(Unit.notes)).order_by(Unit.id).all()
+    timetables = {}
+    for timetable in File.query.filter(File.type.in_(['class_timetable', 'exam_timetable'])).order_by(File.id):
+        timetables.setdefault(timetable.type, timetable)
+    today = datetime.now(timezone.utc).date()
+    assignments = Assignment.query.filter(Assignment.due_date >= today).order_by(Assignment.due_date).all()
+    return {
+        'units': units,
+        'class_timetable': timetables.get('class_timetable'),
+        'exam_timetable': timetables.get('exam_timetable'),
+        'assignments': assignments,
+    }
+
+# Cross-process job locks
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def acquire_lock(name, ttl_seconds):
+    """Take or renew the named lock for this process; False if another process holds it."""
+    now = utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    try:
+        taken = JobLock.query.filter(
+            JobLock.name == name,
+            or_(JobLock.expires_at < now, JobLock.owner == PROCESS_ID)
+        ).update({'owner': PROCESS_ID, 'expires_at': expires_at}, synchronize_session=False)
+        if not taken:
+            if db.session.get(JobLock, name) is not None:
+                db.session.rollback()
+                return False
+            db.session.add(JobLock(name=name, owner=PROCESS_ID, expires_at=expires_at))
+        db.session.commit()
+        return True
+    except IntegrityError:
+        db.session.rollback()
+        return False
+
+def release_lock(name):
+    JobLock.query.filter_by(name=name, owner=PROCESS_ID).update(
+        {'expires_at': utcnow()}, synchronize_session=False)
+    db.session.commit()
+
+# Rendered dashboard cache, invalidated by every handler that writes
+class DatabaseGeneration(SharedGeneration):
+    """Cache generation kept in a CacheGeneration row, so an invalidation in
+    one worker or machine empties the page cache of every other one.
+
+    Uses the current db.session; callers invalidate after committing their own
+    writes, so the bump commits nothing else.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def _current(self):
+        row = db.session.execute(
+            db.select(CacheGeneration.value, CacheGeneration.changed_at).filter_by(name=self.name)
+        ).first()
+        if row is None:
+            return 0, None
+        return row.value, row.changed_at.replace(tzinfo=timezone.utc)
+
+    def read(self):
+        try:
+            return self._current()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error reading cache generation: {str(e)}")
+            return None
+
+    def bump(self):
+        for attempt in range(2):
+            try:
+                now = utcnow()
+                bumped = CacheGeneration.query.filter_by(name=self.name).update(
+                    {'value': CacheGeneration.value + 1, 'changed_at': now}, synchronize_session=False)
+                if not bumped:
+                    db.session.add(CacheGeneration(name=self.name, value=1, changed_at=now))
+                db.session.commit()
+                return self._current()
+            except IntegrityError:
+                # Another process created the row first; bump that one.
+                db.session.rollback()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error bumping cache generation: {str(e)}")
+                return None
+        return None
+
+# A single worker sees all its own invalidations, so only share when needed:
+# a shared cache reads the generation row at most every DASHBOARD_CACHE_SYNC_SECONDS.
+dashboard_cache = PageCache(ttl=app.config['DASHBOARD_CACHE_TTL'],
+                            shared=DatabaseGeneration('dashboard') if app.config['DASHBOARD_CACHE_SHARED'] else None,
+                            sync_interval=app.config['DASHBOARD_CACHE_SYNC_SECONDS'])
+
+# Tech news
+NEWS_CACHE_KEY = 'technology'
+news_refresh_running = threading.Lock()
+
+def get_tech_news():
+    """Return the last good articles, starting a background refresh when they are stale.
+
+    A failed fetch leaves fetched_at alone, so attempted_at holds off the next
+    try for NEWS_RETRY_INTERVAL instead of calling NewsAPI on every page view.
+    """
+    entry = db.session.get(NewsCache, NEWS_CACHE_KEY)
+    now = utcnow()
+    max_age = timedelta(seconds=app.config['NEWS_MAX_AGE'])
+    retry_interval = timedelta(seconds=app.config['NEWS_RETRY_INTERVAL'])
+    stale = entry is None or entry.fetched_at is None or now - entry.fetched_at > max_age
+    retrying = entry is not None and entry.attempted_at is not None and now - entry.attempted_at < retry_interval
+    if stale and not retrying:
+        refresh_tech_news_async()
+    return entry.articles if entry else []
+
+def refresh_tech_news_async():
+    if news_refresh_running.locked():
+        return
+    threading.Thread(target=fetch_tech_news, daemon=True).start()
+
 def fetch_tech_news():
-    global tech_news_cache
+    """Fetch headlines into NewsCache. Only the process holding the lock fetches,
+    and a failed fetch keeps the previous articles instead of clearing them."""
+    if not news_refresh_running.acquire(blocking=False):
+        return
+    try:
+        with app.app_context():
+            if not acquire_lock('fetch_tech_news', ttl_seconds=60):
+                logger.info("Tech news fetch already running in another process")
+                return
+            try:
+                articles, error = download_tech_news()
+                entry = db.session.get(NewsCache, NEWS_CACHE_KEY) or NewsCache(key=NEWS_CACHE_KEY, articles=[])
+                entry.attempted_at = utcnow()
+                if articles:
+                    entry.articles = articles
+                    entry.fetched_at = utcnow()
+                    entry.last_error = None
+                else:
+                    entry.last_error = error[:200]
+                db.session.add(entry)
+                db.session.commit()
+                if articles:
+                    dashboard_cache.invalidate()
+                    broadcast('news_updated', {'articles': articles})
+            finally:
+                release_lock('fetch_tech_news')
+    except Exception as e:
+        logger.error(f"Error storing news: {str(e)}")
+    finally:
+        news_refresh_running.release()
+
+def download_tech_news():
+    """Return (articles, error) from NewsAPI; articles is empty on any failure."""
     try:
         api_key = app.config['NEWS_API_KEY']
         timestamp = int(time.time())
-        url = f"https://newsapi.org/v2/top-headlines?category=technology&apiKey={api_key}&language=en&pageSize=5&_={timestamp}"
-        logger.info(f"Fetching news from: {url}")
-        response = requests.get(url, timeout=10)
+        url = f"{app.config['NEWS_API_BASE']}/v2/top-headlines?category=technology&apiKey={api_key}&language=en&pageSize=5&_={timestamp}"
+        logger.info("Fetching tech news")
+        response = http_client.get(url)
         if response.status_code == 200:
             articles = response.json().get('articles', [])
             if articles:
-                tech_news_cache = [
+                logger.info(f"Tech news fetched successfully: {len(articles)} articles")
+                return [
                     {
                         'title': article['title'],
                         'description': article['description'] or 'No description available',
@@ -145,45 +565,469 @@ def fetch_tech_news():
                         'fetched_at': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
                     }
                     for article in articles
-                ]
-                logger.info(f"Tech news fetched successfully: {len(articles)} articles")
-            else:
-                tech_news_cache = []
-                logger.warning("No articles returned from News API")
-        else:
-            logger.error(f"News API error: {response.status_code} - {response.text}")
-            tech_news_cache = []
+                ], None
+            logger.warning("No articles returned from News API")
+            return [], 'No articles returned'
+        logger.error(f"News API error: {response.status_code} - {response.text}")
+        return [], f'HTTP {response.status_code}'
     except Exception as e:
         logger.error(f"Error fetching news: {str(e)}")
-        tech_news_cache = []
+        return [], str(e)
+
+# Note search indexing
+search_indexing = threading.Lock()
+extraction_pool = None
+
+def get_extraction_pool():
+    global extraction_pool
+    if extraction_pool is None and app.config['SEARCH_WORKERS'] > 0:
+        # spawn, not fork: a child forked from an eventlet worker inherits the
+        # hub with its green threads and sockets, and goes on accepting and
+        # half-serving requests. Spawned children only import search_index
+        # (and app.py as __mp_main__ under `python app.py`, which is harmless
+        # since importing it starts nothing).
+        extraction_pool = ProcessPoolExecutor(max_workers=app.config['SEARCH_WORKERS'],
+                                              mp_context=multiprocessing.get_context('spawn'))
+        atexit.register(shutdown_extraction_pool)
+    return extraction_pool
+
+def shutdown_extraction_pool():
+    extraction_pool.shutdown(wait=False, cancel_futures=True)
+    # Under eventlet the pool's manager thread can be gone by the time atexit
+    # runs, leaving idle children that multiprocessing would wait on forever.
+    for child in multiprocessing.active_children():
+        child.terminate()
+
+def stored_name_of(note):
+    return blob_name(note.content_hash, note.filename) if note.content_hash else note.filename
+
+def index_pending_notes():
+    """Extract and index every note whose content changed since it was last indexed.
+
+    Text is extracted once per distinct blob in the process pool; notes whose
+    hash is already in the index reuse that text.
+    """
+    if not search_indexing.acquire(blocking=False):
+        return
+    try:
+        with app.app_context():
+            notes = db.session.query(File.id, File.filename, File.content_hash).filter(File.type == 'note').all()
+            search_index.remove_missing([note.id for note in notes])
+            indexed = search_index.indexed_hashes()
+            pending = [note for note in notes if indexed.get(note.id) != (note.content_hash or '')]
+            indexed_by_hash = {content_hash: file_id for file_id, content_hash in indexed.items() if content_hash}
+            batch_size = app.config['SEARCH_BATCH_SIZE']
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                reusable = {note.content_hash: indexed_by_hash[note.content_hash]
+                            for note in batch if note.content_hash in indexed_by_hash}
+                bodies_by_id = search_index.bodies(set(reusable.values()))
+                known = {content_hash: bodies_by_id[file_id]
+                         for content_hash, file_id in reusable.items() if file_id in bodies_by_id}
+                paths = {}
+                for note in batch:
+                    if note.content_hash not in known:
+                        paths[stored_name_of(note)] = os.path.join(app.config['UPLOAD_FOLDER'], stored_name_of(note))
+                pool = get_extraction_pool()
+                names = list(paths)
+                bodies = pool.map(extract_text, paths.values(), chunksize=8) if pool else map(extract_text, paths.values())
+                extracted = dict(zip(names, bodies))
+                documents = []
+                for note in batch:
+                    if note.content_hash in known:
+                        body = known[note.content_hash]
+                    else:
+                        body = extracted[stored_name_of(note)]
+                    documents.append((note.id, note.filename, body, note.content_hash or ''))
+                search_index.upsert(documents)
+            if pending:
+                logger.info(f"Indexed {len(pending)} notes for search")
+    except Exception as e:
+        logger.error(f"Error indexing notes: {str(e)}")
+    finally:
+        search_indexing.release()
+
+def index_pending_notes_async():
+    if not search_indexing.locked():
+        threading.Thread(target=index_pending_notes, daemon=True).start()
+
+# Timetable ingestion
+TIMETABLE_TYPES = ('class_timetable', 'exam_timetable')
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+timetable_zone = ZoneInfo(app.config['TIMETABLE_TIMEZONE'])
+timetable_ingesting = threading.Lock()
+TIMETABLE_LOCK_TTL = 300  # Seconds, well above the time to parse both timetables
+
+def ingest_timetables():
+    """Parse each current timetable into TimetableSession rows.
+
+    A timetable whose content hash matches the rows already stored is not
+    re-read; its rows are only re-pointed at the new File. Otherwise the old
+    rows are swapped for the new ones in a single transaction.
+
+    The worker that took an upload and the scheduler's leader can both get
+    here, so the run holds the 'ingest_timetables' JobLock; a second process
+    waits for it and then finds the rows up to date.
+    """
+    with timetable_ingesting:
+        with app.app_context():
+            try:
+                wait_for_lock('ingest_timetables', TIMETABLE_LOCK_TTL)
+            except RuntimeError as e:
+                logger.error(f"Skipping timetable ingestion: {str(e)}")
+                return
+            try:
+                for timetable_type in TIMETABLE_TYPES:
+                    try:
+                        ingest_timetable(timetable_type)
+                    except Exception as e:
+                        db.session.rollback()
+                        logger.error(f"Error ingesting {timetable_type}: {str(e)}")
+            finally:
+                release_lock('ingest_timetables')
+
+def ingest_timetable(timetable_type):
+    timetable = File.query.filter_by(type=timetable_type).order_by(File.id.desc()).first()
+    stored = db.session.query(TimetableSession.file_id, TimetableSession.content_hash) \
+        .filter_by(timetable_type=timetable_type).first()
+    sessions = TimetableSession.query.filter_by(timetable_type=timetable_type)
+    if timetable is None:
+        if stored:
+            sessions.delete(synchronize_session=False)
+            db.session.commit()
+        return
+    if stored and timetable.content_hash and stored.content_hash == timetable.content_hash:
+        if stored.file_id != timetable.id:
+            sessions.update({'file_id': timetable.id}, synchronize_session=False)
+            db.session.commit()
+        return
+    if stored and stored.file_id == timetable.id:
+        return
+    rows = parse_timetable(os.path.join(app.config['UPLOAD_FOLDER'], timetable.stored_name))
+    for row in rows:
+        row.update(timetable_type=timetable_type, file_id=timetable.id, content_hash=timetable.content_hash)
+    sessions.delete(synchronize_session=False)
+    if rows:
+        db.session.execute(db.insert(TimetableSession), rows)
+    db.session.commit()
+    logger.info(f"Parsed {len(rows)} sessions from {timetable_type} {timetable.filename}")
+
+def ingest_timetables_async():
+    threading.Thread(target=ingest_timetables, daemon=True).start()
+
+def timetable_now():
+    return datetime.now(timetable_zone).replace(tzinfo=None)
+
+def session_payload(session_row, on):
+    return {
+        'unit': session_row.unit,
+        'type': session_row.timetable_type,
+        'day': DAY_NAMES[on.weekday()],
+        'date': on.strftime('%d/%m/%Y'),
+        'start': session_row.start_time.strftime('%H:%M'),
+        'end': session_row.end_time.strftime('%H:%M') if session_row.end_time else None,
+        'venue': session_row.venue,
+    }
+
+def next_occurrence(session_row, now):
+    """When `session_row` next starts after `now`, or None if it is over."""
+    if session_row.session_date is not None:
+        start = datetime.combine(session_row.session_date, session_row.start_time)
+        return start if start >= now else None
+    days_ahead = (session_row.day - now.weekday()) % 7
+    start = datetime.combine(now.date() + timedelta(days=days_ahead), session_row.start_time)
+    return start if start >= now else start + timedelta(days=7)
 
 # Initialize scheduler
+scheduler = BackgroundScheduler()
+
+def timed_job(func):
+    @wraps(func)
+    def run():
+        start = time.perf_counter()
+        try:
+            return func()
+        except Exception:
+            JOB_FAILURES.inc(job=func.__name__)
+            raise
+        finally:
+            JOB_DURATION.observe(time.perf_counter() - start, job=func.__name__)
+    return run
+
+def add_scheduled_jobs():
+    scheduler.add_job(
+        func=timed_job(fetch_tech_news),
+        trigger=IntervalTrigger(minutes=30),
+        id='fetch_tech_news_job',
+        name='Fetch tech news every 30 minutes',
+        replace_existing=True
+    )
+    scheduler.add_job(
+        func=timed_job(purge_expired_assignments),
+        trigger=IntervalTrigger(hours=1),
+        id='purge_expired_assignments_job',
+        name='Purge expired assignments every hour',
+        next_run_time=datetime.now(timezone.utc),
+        replace_existing=True
+    )
+    scheduler.add_job(
+        func=timed_job(index_pending_notes),
+        trigger=IntervalTrigger(minutes=10),
+        id='index_pending_notes_job',
+        name='Index new or changed notes for search every 10 minutes',
+        next_run_time=datetime.now(timezone.utc),
+        replace_existing=True
+    )
+    scheduler.add_job(
+        func=timed_job(ingest_timetables),
+        trigger=IntervalTrigger(hours=1),
+        id='ingest_timetables_job',
+        name='Parse new or changed timetables every hour',
+        next_run_time=datetime.now(timezone.utc),
+        replace_existing=True
+    )
+
+def remove_scheduled_jobs():
+    for job_id in ('fetch_tech_news_job', 'purge_expired_assignments_job', 'index_pending_notes_job',
+                   'ingest_timetables_job'):
+        if scheduler.get_job(job_id):
+            scheduler.remove_job(job_id)
+
+def scheduler_heartbeat():
+    """Run the periodic jobs only in the process that holds the scheduler lock.
+
+    Every worker runs this heartbeat; the holder renews its lease, and if it
+    dies another worker takes over once the lease expires.
+    """
+    try:
+        with app.app_context():
+            leader = acquire_lock('scheduler', app.config['SCHEDULER_LOCK_TTL'])
+    except Exception as e:
+        logger.error(f"Scheduler heartbeat failed: {str(e)}")
+        leader = False
+    if leader and not scheduler.get_job('fetch_tech_news_job'):
+        add_scheduled_jobs()
+        logger.info(f"{PROCESS_ID} is now running scheduled jobs")
+    elif not leader and scheduler.get_job('fetch_tech_news_job'):
+        remove_scheduled_jobs()
+        logger.info(f"{PROCESS_ID} stopped running scheduled jobs")
+
+def shutdown_scheduler():
+    scheduler.shutdown(wait=False)
+    try:
+        with app.app_context():
+            release_lock('scheduler')
+    except Exception as e:
+        logger.error(f"Failed to release scheduler lock: {str(e)}")
+
 def init_scheduler():
     try:
-        scheduler = BackgroundScheduler()
         scheduler.add_job(
-            func=fetch_tech_news,
-            trigger=IntervalTrigger(minutes=30),
-            id='fetch_tech_news_job',
-            name='Fetch tech news every 30 minutes',
+            func=timed_job(scheduler_heartbeat),
+            trigger=IntervalTrigger(seconds=app.config['SCHEDULER_LOCK_TTL'] // 3),
+            id='scheduler_heartbeat_job',
+            name='Elect the process that runs scheduled jobs',
+            next_run_time=datetime.now(timezone.utc),
             replace_existing=True
         )
         scheduler.start()
         logger.info("APScheduler started successfully")
-        atexit.register(lambda: scheduler.shutdown())
+        atexit.register(shutdown_scheduler)
     except Exception as e:
         logger.error(f"Failed to start APScheduler: {str(e)}")
 
 # Initialize database
+BOOTSTRAP_LOCK_TTL = 600  # Seconds a crashed bootstrap keeps others waiting
+
+def create_lock_table():
+    """Create the job_lock table on its own; the bootstrap lock lives in it."""
+    for attempt in range(3):
+        try:
+            JobLock.__table__.create(db.engine, checkfirst=True)
+            return
+        except (IntegrityError, OperationalError, ProgrammingError) as e:
+            # Another worker created it between the check and the CREATE.
+            db.session.rollback()
+            if attempt == 2:
+                raise
+            logger.warning(f"Creating job_lock raced with another worker, retrying: {str(e)}")
+            time.sleep(0.5)
+
+def wait_for_lock(name, ttl_seconds):
+    # A crashed holder's lock expires after ttl_seconds, so waiting longer is pointless.
+    deadline = time.monotonic() + ttl_seconds + 60
+    while True:
+        try:
+            if acquire_lock(name, ttl_seconds):
+                return
+        except OperationalError:
+            db.session.rollback()  # SQLite busy; try again
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Timed out waiting for the {name} lock")
+        time.sleep(0.5)
+
+def bootstrap_database():
+    """Create or upgrade the schema and the default admin account.
+
+    Every worker runs this on start, so the work is serialized behind the
+    'bootstrap_database' JobLock: one worker migrates while the others wait,
+    then find nothing left to do. A failure is raised so the worker does not
+    serve requests against a half-migrated schema.
+    """
+    with app.app_context():
+        create_lock_table()
+        wait_for_lock('bootstrap_database', BOOTSTRAP_LOCK_TTL)
+        try:
+            db.create_all()
+            run_migrations(db.engine, db.metadata)
+            SearchIndex(db.engine).create_schema()
+            if not Admin.query.first():
+                hashed_password = bcrypt.hashpw('admin123'.encode('utf-8'), bcrypt.gensalt())
+                admin = Admin(username='admin', password_hash=hashed_password)
+                db.session.add(admin)
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            release_lock('bootstrap_database')
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create or upgrade the database schema and the default admin."""
+    bootstrap_database()
+    click.echo(f"Database ready at {db.engine.url.render_as_string(hide_password=True)}")
+
 with app.app_context():
-    db.create_all()
-    if not Admin.query.first():
-        hashed_password = bcrypt.hashpw('admin123'.encode('utf-8'), bcrypt.gensalt())
-        admin = Admin(username='admin', password_hash=hashed_password)
-        db.session.add(admin)
-        db.session.commit()
+    search_index = SearchIndex(db.engine)
+
+    @event.listens_for(db.engine, 'before_cursor_execute')
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_started'] = time.perf_counter()
 
-init_scheduler()
+    @event.listens_for(db.engine, 'after_cursor_execute')
+    def record_query_metrics(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info.pop('query_started', time.perf_counter())
+        DB_QUERIES.inc()
+        DB_QUERY_SECONDS.inc(seconds)
+        if has_request_context() and 'db_queries' in g:
+            g.db_queries += 1
+            g.db_seconds += seconds
+
+# Dashboard change events
+def broadcast(event, payload):
+    """Push a dashboard change to every connected client."""
+    try:
+        socketio.emit(event, payload)
+    except Exception as e:
+        logger.error(f"Failed to emit {event}: {str(e)}")
+
+def file_payload(file):
+    return {
+        'id': file.id,
+        'unit_id': file.unit_id,
+        'type': file.type,
+        'filename': file.filename,
+        'url': url_for('uploaded_file', filename=file.stored_name),
+        'upload_date': file.upload_date.strftime('%d/%m/%Y') if file.upload_date else None,
+    }
+
+def assignment_payload(assignment):
+    return {
+        'id': assignment.id,
+        'topic': assignment.topic,
+        'remark': assignment.remark,
+        'due_date': assignment.due_date.strftime('%d/%m/%Y'),
+        'posted_date': assignment.posted_date.strftime('%d/%m/%Y') if assignment.posted_date else None,
+    }
+
+def unit_payload(unit):
+    return {'id': unit.id, 'name': unit.name, 'lecturer': unit.lecturer, 'phone': unit.phone, 'email': unit.email}
+
+def dashboard_response(page):
+    response = make_response(page.body)
+    response.set_etag(page.etag)
+    response.last_modified = page.last_modified
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+# File serving
+CONTENT_ADDRESSED_NAME = re.compile(r'^([0-9a-f]{64})(\.[a-z0-9]+)?$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+@lru_cache(maxsize=4096)
+def _content_etag(path, mtime_ns, size):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(app.config['UPLOAD_CHUNK_SIZE']), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def send_stored_file(folder, filename, as_attachment=False, accel_location=None):
+    """Send a file from `folder` with a strong content ETag and Range support.
+
+    Content-addressed blobs already carry their SHA-256 in the name and are
+    served as immutable; anything else is hashed once per (mtime, size) and
+    must be revalidated. With SENDFILE_MODE set the bytes are left to the
+    front proxy via X-Sendfile or X-Accel-Redirect.
+    """
+    filename = secure_filename(filename)
+    path = safe_join(folder, filename)
+    if not filename or path is None or not os.path.isfile(path):
+        raise NotFound()
+    match = CONTENT_ADDRESSED_NAME.match(filename)
+    if match:
+        etag = match.group(1)
+    else:
+        stat = os.stat(path)
+        etag = _content_etag(path, stat.st_mtime_ns, stat.st_size)
+
+    if app.config['SENDFILE_MODE'] == 'x-accel' and accel_location:
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = f"{accel_location.rstrip('/')}/{filename}"
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if as_attachment:
+            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response.set_etag(etag)
+        response = response.make_conditional(request)
+    else:
+        # send_file already answers If-None-Match and Range requests.
+        response = send_from_directory(folder, filename, as_attachment=as_attachment, etag=etag)
+
+    if match:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+@app.route('/cache_stats')
+def cache_stats():
+    return jsonify(dashboard_cache.stats())
+
+DASHBOARD_CACHE_STATS = metrics.gauge('nexushub_dashboard_cache', 'Rendered dashboard cache counters (see /cache_stats).', ['stat'])
+SEND_QUEUE_PENDING = metrics.gauge('nexushub_send_queue_pending', 'Outbound jobs waiting for a worker.')
+PROCESS_INFO = metrics.gauge('nexushub_process_info', 'Identifies the worker process that served this scrape.', ['process'])
+
+@metrics.add_collector
+def collect_runtime_stats():
+    stats = dashboard_cache.stats()
+    for stat in ('hits', 'misses', 'invalidations', 'entries'):
+        DASHBOARD_CACHE_STATS.set(stats[stat], stat=stat)
+    SEND_QUEUE_PENDING.set(send_queue.pending())
+    for state, count in upload_slots.stats().items():
+        UPLOAD_SLOTS.set(count, state=state)
+    PROCESS_INFO.set(1, process=PROCESS_ID)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    token = app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', '').encode('utf-8'),
+                                         f'Bearer {token}'.encode('utf-8')):
+        return jsonify(error='Unauthorized'), 401
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/test')
 def test():
@@ -191,15 +1035,21 @@ def test():
     return "Fuck yeah, it’s alive!"
 
 @app.route('/', methods=['GET', 'POST'])
+@limiter.shared_limit(lambda: app.config['UPLOAD_RATE_LIMIT'], scope='uploads', exempt_when=lambda: not is_upload())
+@limiter.shared_limit(lambda: app.config['WRITE_RATE_LIMIT'], scope='writes',
+                      exempt_when=lambda: not is_form_post('assignment_topic'))
+@limiter.shared_limit(lambda: app.config['SECRET_KEY_RATE_LIMIT'], scope='secret_keys',
+                      exempt_when=lambda: not is_form_post('delete_unit_id'))
 def index():
     logger.info("Hit / Index route")
+    if request.method == 'GET':
+        cached = dashboard_cache.get('index')
+        if cached:
+            return dashboard_response(cached)
     try:
-        units = Unit.query.all()
-        class_timetable = File.query.filter_by(type='class_timetable').first()
-        exam_timetable = File.query.filter_by(type='exam_timetable').first()
-        assignments = Assignment.query.order_by(Assignment.due_date).all()
+        generation = dashboard_cache.generation()
         telegram_form = TelegramMessageForm()
-        news_articles = tech_news_cache
+        news_articles = get_tech_news()
         error = None
 
         if request.method == 'POST':
@@ -209,12 +1059,15 @@ def index():
                     unit_id = sanitize_input(request.form.get('unit_id', ''))
                     if file and allowed_file(file.filename):
                         filename = secure_filename(file.filename)
-                        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                        file.save(file_path)
-                        logger.info(f"Saved note file: {file_path}")
-                        note = File(filename=filename, type='note', unit_id=unit_id or None)
+                        stored_name, content_hash, size = save_upload(file, filename)
+                        logger.info(f"Saved note file: {filename} as {stored_name}")
+                        note = File(filename=filename, type='note', unit_id=unit_id or None,
+                                    content_hash=content_hash, size=size)
                         db.session.add(note)
                         db.session.commit()
+                        dashboard_cache.invalidate()
+                        broadcast('note_added', file_payload(note))
+                        index_pending_notes_async()
                         flash('Note uploaded successfully', 'success')
                         return redirect(url_for('index', _anchor='notes'))
                     else:
@@ -225,16 +1078,19 @@ def index():
                     timetable_type = sanitize_input(request.form.get('timetable_type', ''))
                     if file and allowed_file(file.filename) and timetable_type in ['class_timetable', 'exam_timetable']:
                         filename = secure_filename(file.filename)
-                        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                        file.save(file_path)
-                        logger.info(f"Saved {timetable_type}: {file_path}")
+                        stored_name, content_hash, size = save_upload(file, filename)
+                        logger.info(f"Saved {timetable_type}: {filename} as {stored_name}")
                         existing_timetable = File.query.filter_by(type=timetable_type).first()
                         if existing_timetable:
                             db.session.delete(existing_timetable)
                             logger.info(f"Deleted existing {timetable_type}")
-                        timetable = File(filename=filename, type=timetable_type)
+                        timetable = File(filename=filename, type=timetable_type,
+                                         content_hash=content_hash, size=size)
                         db.session.add(timetable)
                         db.session.commit()
+                        dashboard_cache.invalidate()
+                        broadcast('timetable_replaced', file_payload(timetable))
+                        ingest_timetables_async()
                         flash(f'{timetable_type.replace("_", " ").title()} uploaded successfully', 'success')
                         return redirect(url_for('index', _anchor='timetables'))
                     else:
@@ -246,10 +1102,12 @@ def index():
                     due_date = sanitize_input(request.form.get('assignment_due_date', ''))
                     if topic and remark and due_date:
                         try:
-                            due_date = datetime.strptime(due_date, '%Y-%m-%d').strftime('%d/%m/%Y')
+                            due_date = datetime.strptime(due_date, '%Y-%m-%d').date()
                             assignment = Assignment(topic=topic, remark=remark, due_date=due_date)
                             db.session.add(assignment)
                             db.session.commit()
+                            dashboard_cache.invalidate()
+                            broadcast('assignment_posted', assignment_payload(assignment))
                             flash('Assignment posted', 'success')
                         except ValueError:
                             flash('Invalid due date format', 'error')
@@ -259,14 +1117,17 @@ def index():
                     unit_id = sanitize_input(request.form.get('delete_unit_id', ''))
                     secret_key = sanitize_input(request.form.get('secret_key', ''))
                     expected_key = app.config['UNIT_DELETE_SECRET_KEY']
-                    if secret_key != expected_key:
+                    if not hmac.compare_digest(secret_key.encode('utf-8'), expected_key.encode('utf-8')):
                         flash('Invalid secret key', 'error')
                         logger.warning(f"Invalid secret key attempt for unit {unit_id}")
                         return redirect(url_for('index', _anchor='notes'))
                     if unit_id:
                         unit = Unit.query.get_or_404(unit_id)
+                        deleted_id = unit.id
                         db.session.delete(unit)
                         db.session.commit()
+                        dashboard_cache.invalidate()
+                        broadcast('unit_deleted', {'unit_id': deleted_id})
                         flash('Unit deleted successfully', 'success')
                         logger.info(f"Unit {unit_id} deleted with valid secret key")
                     else:
@@ -279,53 +1140,138 @@ def index():
                 flash(f'Error: {str(e)}', 'error')
                 logger.error(f"Error in POST /: {str(e)}")
 
-        today = datetime.now(timezone.utc).strftime('%d/%m/%Y')
-        for assignment in assignments:
-            try:
-                if datetime.strptime(assignment.due_date, '%d/%m/%Y') < datetime.strptime(today, '%d/%m/%Y'):
-                    db.session.delete(assignment)
-            except Exception as e:
-                logger.error(f"Error deleting assignment {assignment.id}: {str(e)}")
-        db.session.commit()
-
-        assignments = Assignment.query.order_by(Assignment.due_date).all()
-        return render_template('index.html', units=units, class_timetable=class_timetable,
-                              exam_timetable=exam_timetable, assignments=assignments,
-                              telegram_form=telegram_form, news_articles=news_articles,
-                              error=error)
+        dashboard = load_dashboard()
+        body = render_template('index.html', telegram_form=telegram_form,
+                               news_articles=news_articles, error=error, **dashboard)
+        return dashboard_response(dashboard_cache.set('index', body, generation))
     except Exception as e:
         logger.error(f"Error in /: {str(e)}")
         flash('Server error, try again later', 'error')
         return render_template('index.html', error=str(e))
 
+def deliver_telegram(message):
+    bot_token = app.config['TELEGRAM_BOT_TOKEN']
+    telegram_url = f"{app.config['TELEGRAM_API_BASE']}/bot{bot_token}/sendMessage"
+    payload = {
+        'chat_id': app.config['TELEGRAM_CHAT_ID'],
+        'text': message
+    }
+    try:
+        response = http_client.post(telegram_url, json=payload)
+    except requests.exceptions.RequestException as e:
+        raise RuntimeError(f"Network issue ({str(e)})")
+    if response.status_code != 200:
+        logger.error(f"Telegram API error: {response.text}")
+        try:
+            error_msg = response.json().get('description', 'Unknown error')
+        except ValueError:
+            error_msg = f'HTTP {response.status_code}'
+        raise RuntimeError(f"Telegram error: {error_msg}")
+
+def telegram_room(job_id):
+    return f'telegram:{job_id}'
+
+def report_telegram_status(job_id, result, error):
+    status = {'job_id': job_id, 'status': 'failed' if error else 'sent'}
+    if error:
+        status['error'] = str(error)[:200]
+    # Stored for an hour so a client that reconnects after the redirect can
+    # still ask, whichever worker its socket lands on.
+    with app.app_context():
+        try:
+            now = utcnow()
+            TelegramStatus.query.filter(TelegramStatus.reported_at < now - timedelta(hours=1)).delete()
+            db.session.merge(TelegramStatus(job_id=job_id, status=status['status'],
+                                            error=status.get('error'), reported_at=now))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error storing Telegram status: {str(e)}")
+    # Only the client that submitted the message joined this job's room.
+    socketio.emit('telegram_status', status, to=telegram_room(job_id))
+
+@app.route('/search')
+def search():
+    query = request.args.get('q', '').strip()[:200]
+    limit = max(1, min(request.args.get('limit', 20, type=int), 50))
+    start = time.perf_counter()
+    try:
+        hits = search_index.search(query, limit)
+        files = {}
+        if hits:
+            rows = db.session.query(File, Unit.name).outerjoin(Unit, File.unit_id == Unit.id) \
+                .filter(File.id.in_([hit['file_id'] for hit in hits])).all()
+            files = {file.id: (file, unit_name) for file, unit_name in rows}
+        results = []
+        for hit in hits:
+            if hit['file_id'] not in files:
+                continue
+            file, unit_name = files[hit['file_id']]
+            hit.update(unit_id=file.unit_id, unit=unit_name,
+                       url=url_for('uploaded_file', filename=file.stored_name))
+            results.append(hit)
+    except Exception as e:
+        logger.error(f"Error in /search: {str(e)}")
+        return jsonify(query=query, results=[], error='Search failed'), 500
+    return jsonify(query=query, results=results, took_ms=round((time.perf_counter() - start) * 1000, 2))
+
+@app.route('/schedule/today')
+def schedule_today():
+    """Today's sessions from the parsed timetables, optionally for one unit."""
+    now = timetable_now()
+    today = now.date()
+    unit = normalize_unit(request.args.get('unit', ''))[:100]
+    try:
+        query = TimetableSession.query.filter(or_(
+            (TimetableSession.session_date.is_(None)) & (TimetableSession.day == today.weekday()),
+            TimetableSession.session_date == today,
+        ))
+        if unit:
+            query = query.filter(TimetableSession.unit_key.startswith(unit, autoescape=True))
+        sessions = [session_payload(row, today) for row in query.order_by(TimetableSession.start_time).all()]
+    except Exception as e:
+        logger.error(f"Error in /schedule/today: {str(e)}")
+        return jsonify(error='Schedule unavailable'), 500
+    return jsonify(date=today.strftime('%d/%m/%Y'), day=DAY_NAMES[today.weekday()], sessions=sessions)
+
+@app.route('/schedule/next')
+def schedule_next():
+    """The next class or exam for a unit, matched on a prefix of its name or code."""
+    unit = normalize_unit(request.args.get('unit', ''))[:100]
+    if not unit:
+        return jsonify(error='unit is required'), 400
+    now = timetable_now()
+    try:
+        rows = TimetableSession.query.filter(
+            TimetableSession.unit_key.startswith(unit, autoescape=True),
+            or_(TimetableSession.session_date.is_(None), TimetableSession.session_date >= now.date()),
+        ).all()
+    except Exception as e:
+        logger.error(f"Error in /schedule/next: {str(e)}")
+        return jsonify(error='Schedule unavailable'), 500
+    upcoming = [(start, row) for row in rows for start in [next_occurrence(row, now)] if start]
+    if not upcoming:
+        return jsonify(unit=unit, session=None), 404
+    start, row = min(upcoming, key=lambda item: item[0])
+    return jsonify(unit=unit, session=session_payload(row, start.date()),
+                   starts_in_minutes=int((start - now).total_seconds() // 60))
+
 @app.route('/send_telegram', methods=['GET', 'POST'])
+@limiter.limit(lambda: app.config['TELEGRAM_RATE_LIMIT'], methods=['POST'])
 def send_telegram():
     logger.info("Hit /send_telegram")
     form = TelegramMessageForm()
     if request.method == 'POST' and form.validate_on_submit():
-        try:
-            message = sanitize_input(form.message.data)
-            bot_token = app.config['TELEGRAM_BOT_TOKEN']
-            chat_id = app.config['TELEGRAM_CHAT_ID']
-            telegram_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-            payload = {
-                'chat_id': chat_id,
-                'text': message
-            }
-            response = requests.post(telegram_url, json=payload, timeout=10)
-            if response.status_code == 200:
-                flash('Message sent to Telegram successfully', 'success')
-            else:
-                error_msg = response.json().get('description', 'Unknown error')
-                flash(f'Telegram error: {error_msg}', 'error')
-                logger.error(f"Telegram API error: {response.text}")
-        except requests.exceptions.RequestException as e:
-            flash(f'Error sending message: Network issue ({str(e)})', 'error')
-            logger.error(f"Network error in /send_telegram: {str(e)}")
-        except Exception as e:
-            flash(f'Error sending message: {str(e)})', 'error')
-            logger.error(f"Error in /send_telegram: {str(e)}")
-        return redirect(url_for('index', _anchor='links'))
+        message = sanitize_input(form.message.data)
+        job_id = send_queue.submit(deliver_telegram, message, on_done=report_telegram_status)
+        if job_id is None:
+            SHED_REQUESTS.inc(reason='send_queue')
+            logger.warning("Telegram send queue full, message rejected")
+            form.message.errors.append('Telegram queue is full, try again shortly')
+            return (render_template('telegram_message.html', form=form), 503,
+                    {'Retry-After': str(app.config['RETRY_AFTER_SECONDS'])})
+        flash('Message queued for Telegram', 'success')
+        return redirect(url_for('index', telegram_job=job_id, _anchor='links'))
     return render_template('telegram_message.html', form=form)
 
 @app.route('/ai_chat', methods=['GET'])
@@ -370,6 +1316,7 @@ def ai_chat():
         return redirect(url_for('index'))
 
 @app.route('/group_setup', methods=['GET', 'POST'])
+@limiter.shared_limit(lambda: app.config['WRITE_RATE_LIMIT'], scope='writes', methods=['POST'])
 def group_setup():
     logger.info("Hit /group_setup")
     if request.method == 'POST':
@@ -378,6 +1325,7 @@ def group_setup():
             lecturers = request.form.getlist('lecturers[]')
             phones = request.form.getlist('phones[]')
             emails = request.form.getlist('emails[]')
+            added = []
             for name, lecturer, phone, email in zip(units, lecturers, phones, emails):
                 name = sanitize_input(name)
                 lecturer = sanitize_input(lecturer) if lecturer else None
@@ -392,7 +1340,11 @@ def group_setup():
                         continue
                     unit = Unit(name=name, lecturer=lecturer, phone=phone, email=email)
                     db.session.add(unit)
+                    added.append(unit)
             db.session.commit()
+            dashboard_cache.invalidate()
+            for unit in added:
+                broadcast('unit_added', unit_payload(unit))
             flash('Units added successfully', 'success')
             return redirect(url_for('index', _anchor='notes'))
         except Exception as e:
@@ -401,42 +1353,204 @@ def group_setup():
             logger.error(f"Error in /group_setup: {str(e)}")
     return render_template('group_setup.html')
 
+# Bulk import/export
+def write_units(records):
+    """Upsert units by case-insensitive name; returns (inserted, updated)."""
+    existing = {name.lower(): unit_id for unit_id, name in db.session.query(Unit.id, Unit.name)}
+    inserts, updates = [], []
+    for record in records:
+        unit_id = existing.get(record['name'].lower())
+        if unit_id is None:
+            inserts.append(record)
+        else:
+            updates.append(dict(record, id=unit_id))
+    if inserts:
+        db.session.execute(db.insert(Unit), inserts)
+    if updates:
+        db.session.execute(db.update(Unit), updates)
+    return len(inserts), len(updates)
+
+def write_assignments(records):
+    """Upsert assignments by (topic, due date); returns (inserted, updated)."""
+    today = datetime.now(timezone.utc).date()
+    existing = {(topic.lower(), due_date): assignment_id for assignment_id, topic, due_date in
+                db.session.query(Assignment.id, Assignment.topic, Assignment.due_date)
+                .filter(Assignment.due_date >= today)}
+    inserts, updates = [], []
+    for record in records:
+        assignment_id = existing.get((record['topic'].lower(), record['due_date']))
+        if assignment_id is None:
+            inserts.append(dict(record, posted_date=today))
+        else:
+            updates.append(dict(record, id=assignment_id))
+    if inserts:
+        db.session.execute(db.insert(Assignment), inserts)
+    if updates:
+        db.session.execute(db.update(Assignment), updates)
+    return len(inserts), len(updates)
+
+BULK_KINDS = {
+    'units': (Unit, UNIT_FIELDS, write_units),
+    'assignments': (Assignment, ASSIGNMENT_FIELDS, write_assignments),
+}
+
+@app.route('/bulk/<kind>', methods=['POST'])
+@limiter.shared_limit(lambda: app.config['SECRET_KEY_RATE_LIMIT'], scope='secret_keys')
+def bulk_import(kind):
+    """Import units or assignments from a .csv/.xlsx/.xls upload ('file') or a JSON array.
+
+    Rows are validated together and every valid row is written in one
+    transaction; invalid rows are skipped and listed with their row number.
+    """
+    if kind not in BULK_KINDS:
+        return jsonify(error=f'Unknown kind {kind}'), 404
+    expected_key = app.config['BULK_IMPORT_SECRET_KEY'] or ''
+    secret_key = request.headers.get('X-Secret-Key') or request.form.get('secret_key', '')
+    if not expected_key or not hmac.compare_digest(secret_key.encode('utf-8'), expected_key.encode('utf-8')):
+        logger.warning(f"Invalid secret key for bulk import of {kind}")
+        return jsonify(error='Invalid secret key'), 403
+    start = time.perf_counter()
+    try:
+        if request.is_json:
+            frame = read_frame(request.get_json(silent=True), 'json')
+        else:
+            upload = request.files.get('file')
+            if not upload or not upload.filename:
+                return jsonify(error='Send a file field or a JSON array'), 400
+            frame = read_frame(upload.stream, os.path.splitext(upload.filename)[1].lower().lstrip('.'))
+    except BulkError as e:
+        return jsonify(error=str(e)), 400
+
+    write = BULK_KINDS[kind][2]
+    try:
+        if kind == 'units':
+            records, errors = validate_units(frame)
+        else:
+            records, errors = validate_assignments(frame, datetime.now(timezone.utc).date())
+    except Exception as e:
+        logger.error(f"Error validating bulk import of {kind}: {str(e)}")
+        return jsonify(error='Could not validate the rows, nothing was written'), 422
+    try:
+        inserted, updated = write(records) if records else (0, 0)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error in bulk import of {kind}: {str(e)}")
+        return jsonify(error='Import failed, nothing was written'), 500
+    if records:
+        dashboard_cache.invalidate()
+        broadcast('bulk_imported', {'kind': kind, 'inserted': inserted, 'updated': updated})
+    logger.info(f"Bulk import of {kind}: {inserted} inserted, {updated} updated, {len(errors)} row errors")
+    max_errors = app.config['BULK_IMPORT_MAX_ERRORS']
+    status = 422 if errors and not records else 200
+    return jsonify(kind=kind, received=len(frame), inserted=inserted, updated=updated,
+                   error_count=len(errors), errors=errors[:max_errors],
+                   took_ms=round((time.perf_counter() - start) * 1000, 2)), status
+
+@app.route('/bulk/<kind>/export')
+def bulk_export(kind):
+    """Stream every unit or assignment as CSV (default) or JSON (?format=json)."""
+    if kind not in BULK_KINDS:
+        return jsonify(error=f'Unknown kind {kind}'), 404
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'json'):
+        return jsonify(error='format must be csv or json'), 400
+    model, fields, _ = BULK_KINDS[kind]
+    columns = [getattr(model, field) for field in fields]
+
+    def rows():
+        result = db.session.execute(db.select(*columns).order_by(model.id).execution_options(yield_per=1000))
+        for row in result:
+            yield tuple(row)
+
+    chunks = stream_csv(fields, rows()) if fmt == 'csv' else stream_json(fields, rows())
+    response = Response(stream_with_context(chunks),
+                        mimetype='text/csv' if fmt == 'csv' else 'application/json')
+    response.headers['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
 
 @app.route('/Uploads/<filename>')
 def uploaded_file(filename):
-    logger.info(f"Serving file: {filename}")
+    logger.debug(f"Serving file: {filename}")
     try:
-        filename = secure_filename(filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File {filename} not found")
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
-    except Exception as e:
-        logger.error(f"Error serving file {filename}: {str(e)}")
+        return send_stored_file(app.config['UPLOAD_FOLDER'], filename,
+                                accel_location=app.config['X_ACCEL_UPLOADS_LOCATION'])
+    except NotFound:
+        logger.error(f"Error serving file {filename}: not found")
         flash('File not found', 'error')
         return redirect(url_for('index'))
 
 @app.route('/downloads/<filename>')
 def download_file(filename):
-    logger.info(f"Serving download file: {filename}")
+    logger.debug(f"Serving download file: {filename}")
     try:
-        filename = secure_filename(filename)
-        file_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File {filename} not found")
-        return send_from_directory(app.config['OUTPUT_FOLDER'], filename, as_attachment=True)
-    except Exception as e:
-        logger.error(f"Error downloading file {filename}: {str(e)}")
+        return send_stored_file(app.config['OUTPUT_FOLDER'], filename, as_attachment=True,
+                                accel_location=app.config['X_ACCEL_OUTPUTS_LOCATION'])
+    except NotFound:
+        logger.error(f"Error downloading file {filename}: not found")
         flash('File not found', 'error')
         return redirect(url_for('index'))
 
 @socketio.on('connect')
 def handle_connect():
     logger.info("Client connected to SocketIO")
+    SOCKET_CONNECTIONS.inc()
+    SOCKET_CONNECTS.inc()
     emit('response', {'msg': 'Connected to Nexus Hub'})
 
+@socketio.on('disconnect')
+def handle_disconnect():
+    SOCKET_CONNECTIONS.dec()
+
+@socketio.on('telegram_status')
+def handle_telegram_status(data):
+    job_id = (data or {}).get('job_id')
+    if not isinstance(job_id, str) or not job_id:
+        return
+    join_room(telegram_room(job_id))
+    stored = db.session.get(TelegramStatus, job_id)
+    if stored:
+        status = {'job_id': job_id, 'status': stored.status}
+        if stored.error:
+            status['error'] = stored.error
+        emit('telegram_status', status)
+
+# Process startup
+# Importing this module only defines config, models and routes, so gunicorn
+# workers, `flask` commands and scripts pay for none of the startup work below.
+# There is no create_app() factory: app, db, limiter and socketio are built at
+# import time from os.environ (and .env), like every route on them. Settings
+# must therefore be in the environment before the first import; tests set them
+# in tests/conftest.py. start_app() only starts the per-process work around the
+# app.
+app_started = False
+app_starting = threading.Lock()
+
+def start_app():
+    """Finish starting this process and return the app; later calls are no-ops.
+
+    bootstrap_database() runs on every start so a database left by an older
+    release is upgraded before the first request. On an up-to-date schema it
+    only inspects it; the slow bcrypt hash of the default admin is paid once,
+    by whichever start finds no admin (or by `flask --app app init-db`).
+    """
+    global app_started
+    with app_starting:
+        if app_started:
+            return app
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
+        bootstrap_database()
+        init_scheduler()
+        if app.config['PROFILE_SLOW_REQUEST_MS'] > 0 and profiler.start():
+            logger.info(f"Profiling requests slower than {app.config['PROFILE_SLOW_REQUEST_MS']}ms into {app.config['PROFILE_FOLDER']}")
+        refresh_tech_news_async()  # Warm the news cache without holding up startup
+        app_started = True
+    return app
+
 if __name__ == '__main__':
+    start_app()
     port = int(os.environ.get('PORT', 8080))
     logger.info(f"Running on port {port}")
-    fetch_tech_news()  # Initial news fetch
     socketio.run(app, host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
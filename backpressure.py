@@ -0,0 +1,47 @@
+"""Admission control for work that must not pile up inside a worker.
+
+A ConcurrencyLimit lets `capacity` callers in at once and up to `queue_size`
+more wait for a turn, each for at most `timeout` seconds. Anyone beyond that
+is turned away immediately, so the caller can answer 503 with Retry-After
+instead of tying up the worker. Under gunicorn's eventlet worker the
+semaphore is monkey-patched, so waiting yields to other requests.
+"""
+import threading
+
+
+class ConcurrencyLimit:
+    def __init__(self, capacity, queue_size=0, timeout=0.0):
+        self.capacity = capacity
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(capacity)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiting = 0
+
+    def acquire(self):
+        """Take a slot, queueing for one if there is room; return whether one was taken."""
+        acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                if self._waiting >= self.queue_size or self.timeout <= 0:
+                    return False
+                self._waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        if acquired:
+            with self._lock:
+                self._active += 1
+        return acquired
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {'active': self._active, 'waiting': self._waiting}
@@ -0,0 +1,181 @@
+"""Dashboard throughput for ordinary visitors while one client abuses the write paths.
+
+Runs the app under gunicorn with gunicorn.conf.py and PROXY_FIX_X_FOR=1, so
+each client thread can stand for its own IP through X-Forwarded-For. --clients
+visitors load GET / on their own first, and then again while --abusers
+threads from a single IP flood note uploads, /send_telegram posts and unit
+deletes with guessed secret keys. Telegram is a local stub.
+
+The report compares visitor throughput and latency between the two phases.
+It also counts the status codes the abuser got back and the messages that
+reached the Telegram stub. Run with --no-limits to see the same load with
+rate limiting and upload load shedding turned off.
+
+Exits non-zero when visitor throughput under abuse falls below --min-ratio of
+the undisturbed run. Every limit lets a burst through at the start of its
+window, so phases shorter than the default 30 seconds mostly measure the burst.
+
+Usage: python benchmarks/bench_abuse.py [--duration 30] [--clients 4] [--abusers 8] [--no-limits]
+"""
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from common import ROOT, form_csrf_token, free_port, percentile, wait_ready
+from stubs import news_stub, telegram_stub
+
+ABUSER_IP = '203.0.113.66'
+
+
+def visitor(base, ip, deadline, latencies, errors):
+    session = requests.Session()
+    session.headers['X-Forwarded-For'] = ip
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            ok = session.get(f'{base}/', timeout=30).status_code == 200
+        except requests.RequestException:
+            ok = False
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors[0] += not ok
+
+
+def abuser(base, deadline, statuses, payload):
+    session = requests.Session()
+    session.headers['X-Forwarded-For'] = ABUSER_IP
+    attacks = ('upload', 'telegram', 'delete')
+    n = 0
+    while time.perf_counter() < deadline:
+        attack = attacks[n % len(attacks)]
+        n += 1
+        try:
+            if attack == 'upload':
+                response = session.post(f'{base}/', files={'note': (f'flood_{n}.csv', payload)},
+                                        allow_redirects=False, timeout=30)
+            elif attack == 'telegram':
+                session.cookies.clear()
+                csrf_token = form_csrf_token(session, f'{base}/send_telegram')
+                response = session.post(f'{base}/send_telegram', data={'csrf_token': csrf_token, 'message': 'spam'},
+                                        allow_redirects=False, timeout=30)
+            else:
+                response = session.post(f'{base}/', data={'delete_unit_id': '1', 'secret_key': f'guess-{n}'},
+                                        allow_redirects=False, timeout=30)
+            statuses[f'{attack} {response.status_code}'] += 1
+        except requests.RequestException:
+            statuses[f'{attack} error'] += 1
+
+
+def abuse(base, duration, abusers, upload_kb, results):
+    """Flood from `abusers` threads; runs in its own, lower-priority process."""
+    # On one machine the flooding clients compete with the server for CPU;
+    # niceness keeps them from standing in for load the server itself carries.
+    os.nice(10)
+    statuses = collections.Counter()
+    deadline = time.perf_counter() + duration
+    payload = b'x' * (upload_kb * 1024)
+    threads = [threading.Thread(target=abuser, args=(base, deadline, statuses, payload)) for _ in range(abusers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(dict(statuses))
+
+
+def run_phase(base, args, abusers):
+    latencies, errors = [], [0]
+    statuses = {}
+    results = multiprocessing.Queue()
+    flood = None
+    if abusers:
+        flood = multiprocessing.Process(target=abuse, args=(base, args.duration, abusers, args.upload_kb, results))
+        flood.start()
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=visitor, args=(base, f'10.0.0.{i + 1}', deadline, latencies, errors))
+               for i in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if flood:
+        statuses = results.get()
+        flood.join()
+    return {
+        'visitor_requests': len(latencies),
+        'visitor_errors': errors[0],
+        'visitor_rps': round(len(latencies) / args.duration, 1),
+        'visitor_p50_ms': round(percentile(latencies, 50), 3),
+        'visitor_p99_ms': round(percentile(latencies, 99), 3),
+        'abuser_statuses': dict(sorted(statuses.items())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=30, help='seconds per phase')
+    parser.add_argument('--clients', type=int, default=4, help='well-behaved visitor threads')
+    parser.add_argument('--abusers', type=int, default=8, help='threads flooding from one IP')
+    parser.add_argument('--upload-kb', type=int, default=256, help='size of each flooded upload')
+    parser.add_argument('--no-limits', action='store_true', help='turn rate limits and upload shedding off')
+    parser.add_argument('--min-ratio', type=float, default=0.5,
+                        help='fail when visitor rps under abuse drops below this share of the baseline')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='nexushub-abuse-')
+    telegram = telegram_stub(0.05)
+    news = news_stub()
+    port = free_port()
+    env = dict(os.environ,
+               PORT=str(port),
+               WEB_CONCURRENCY='1',
+               LOG_LEVEL='warning',
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'abuse.db')}",
+               UPLOAD_FOLDER=os.path.join(workdir, 'Uploads'),
+               OUTPUT_FOLDER=os.path.join(workdir, 'outputs'),
+               TELEGRAM_API_BASE=telegram.url,
+               NEWS_API_BASE=news.url,
+               PROXY_FIX_X_FOR='1',
+               UNIT_DELETE_SECRET_KEY='bench-delete-key',
+               SECRET_KEY='bench-secret')
+    if args.no_limits:
+        env.update(RATELIMIT_ENABLED='false', MAX_CONCURRENT_UPLOADS='1000', UPLOAD_QUEUE_SIZE='1000')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:start_app()'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+    try:
+        wait_ready(f'{base}/test')
+        baseline = run_phase(base, args, 0)
+        calls_before = telegram.calls
+        abused = run_phase(base, args, args.abusers)
+        abused['telegram_delivered'] = telegram.calls - calls_before
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        telegram.stop()
+        news.stop()
+
+    ratio = abused['visitor_rps'] / baseline['visitor_rps'] if baseline['visitor_rps'] else 0
+    print(json.dumps({
+        'limits': not args.no_limits,
+        'baseline': baseline,
+        'under_abuse': abused,
+        'visitor_rps_ratio': round(ratio, 2),
+    }, indent=2))
+    if ratio < args.min_ratio:
+        sys.exit(f'Visitor throughput under abuse is {ratio:.0%} of the baseline, below {args.min_ratio:.0%}')
+
+
+if __name__ == '__main__':
+    main()
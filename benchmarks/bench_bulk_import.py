@@ -0,0 +1,87 @@
+"""Import N synthetic units through /bulk/units and compare with /group_setup.
+
+About 1% of the rows are invalid so the per-row error path is exercised. The
+same file is then imported again (every row becomes an update) and exported.
+
+Usage: python benchmarks/bench_bulk_import.py [--rows 50000] [--form-rows 5000]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import time
+
+os.environ.setdefault('BULK_IMPORT_SECRET_KEY', 'bench-key')
+
+from common import load_app
+
+
+def make_rows(count, rng):
+    rows = []
+    for i in range(count):
+        phone = f'+2547{rng.randrange(10 ** 8):08d}' if i % 100 else 'not-a-phone'
+        rows.append((f'UNIT {i:06d} Applied Computing', f'Dr Lecturer {i % 400}', phone, f'lecturer{i % 400}@example.ac.ke'))
+    return rows
+
+
+def to_csv(rows):
+    lines = ['name,lecturer,phone,email'] + [','.join(row) for row in rows]
+    return '\n'.join(lines).encode('utf-8')
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, round(time.perf_counter() - start, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--form-rows', type=int, default=5000, help='rows sent through /group_setup for comparison')
+    args = parser.parse_args()
+
+    nexushub = load_app()
+    logging.disable(logging.CRITICAL)
+    client = nexushub.app.test_client()
+    rows = make_rows(args.rows, random.Random(42))
+    payload = to_csv(rows)
+    headers = {'X-Secret-Key': os.environ['BULK_IMPORT_SECRET_KEY']}
+
+    def bulk_import():
+        return client.post('/bulk/units', data={'file': (io.BytesIO(payload), 'units.csv')},
+                           headers=headers, content_type='multipart/form-data').get_json()
+
+    first, first_s = timed(bulk_import)
+    second, second_s = timed(bulk_import)
+    export, export_s = timed(lambda: client.get('/bulk/units/export').data)
+
+    with nexushub.app.app_context():
+        nexushub.db.session.query(nexushub.Unit).delete()
+        nexushub.db.session.commit()
+    form_rows = rows[:args.form_rows]
+    form = {'units[]': [row[0] for row in form_rows], 'lecturers[]': [row[1] for row in form_rows],
+            'phones[]': [row[2] for row in form_rows], 'emails[]': [row[3] for row in form_rows]}
+    _, form_s = timed(lambda: client.post('/group_setup', data=form))
+
+    result = {
+        'rows': args.rows,
+        'bulk_import_s': first_s,
+        'bulk_rows_per_s': round(args.rows / first_s),
+        'inserted': first['inserted'],
+        'error_count': first['error_count'],
+        'bulk_reimport_s': second_s,
+        'updated': second['updated'],
+        'export_csv_s': export_s,
+        'export_bytes': len(export),
+        'group_setup_rows': len(form_rows),
+        'group_setup_s': form_s,
+        'group_setup_rows_per_s': round(len(form_rows) / form_s),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
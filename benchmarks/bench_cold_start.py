@@ -0,0 +1,98 @@
+"""Time to first response of a cold gunicorn start, as on a scale-from-zero.
+
+Each run copies a database prepared by `flask --app app init-db` into a fresh
+folder, starts gunicorn with gunicorn.conf.py and polls GET / until it answers
+200. The time from launching gunicorn to that response is what a visitor waits
+for when Fly.io starts a stopped machine. --fresh-db starts from an empty
+database instead, which adds the schema and admin bootstrap.
+
+Exits non-zero when the median is above --target-ms.
+
+Usage: python benchmarks/bench_cold_start.py [--runs 5] [--target-ms 2000] [--fresh-db]
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from common import ROOT, free_port
+
+
+def prepare_database(workdir, env):
+    path = os.path.join(workdir, 'template.db')
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], cwd=ROOT, check=True,
+                   env=dict(env, DATABASE_URL=f'sqlite:///{path}'), capture_output=True)
+    return path
+
+
+def cold_start(app_spec, env, template, timeout):
+    workdir = tempfile.mkdtemp(prefix='nexushub-cold-')
+    database = os.path.join(workdir, 'cold.db')
+    if template:
+        shutil.copy(template, database)
+    port = free_port()
+    env = dict(env, PORT=str(port), DATABASE_URL=f'sqlite:///{database}',
+               UPLOAD_FOLDER=os.path.join(workdir, 'Uploads'), OUTPUT_FOLDER=os.path.join(workdir, 'outputs'))
+    url = f'http://127.0.0.1:{port}/'
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', app_spec],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if requests.get(url, timeout=timeout).status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except requests.ConnectionError:
+                time.sleep(0.01)
+        raise RuntimeError(f'{url} did not answer within {timeout}s')
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target-ms', type=float, default=2000, help='fail when the median is slower')
+    parser.add_argument('--fresh-db', action='store_true', help='start against an empty database')
+    parser.add_argument('--app', default='app:start_app()', help='gunicorn application spec')
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='nexushub-cold-template-')
+    env = dict(os.environ,
+               WEB_CONCURRENCY='1',
+               LOG_LEVEL='warning',
+               SECRET_KEY='bench-secret',
+               NEWS_API_BASE=f'http://127.0.0.1:{free_port()}')
+    template = None if args.fresh_db else prepare_database(workdir, env)
+    samples = [cold_start(args.app, env, template, args.timeout) for _ in range(args.runs)]
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    median = statistics.median(samples)
+    print(json.dumps({
+        'runs': args.runs,
+        'fresh_db': args.fresh_db,
+        'median_ms': round(median, 1),
+        'min_ms': round(min(samples), 1),
+        'max_ms': round(max(samples), 1),
+        'target_ms': args.target_ms,
+    }, indent=2))
+    if median > args.target_ms:
+        sys.exit(f'Median time to first response {median:.0f}ms is above the {args.target_ms:.0f}ms target')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Time the dashboard queries (load_dashboard) against a large file table.
+
+Usage: python benchmarks/bench_dashboard_queries.py [--files 100000] [--units 200]
+"""
+import argparse
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
+from common import load_app, time_calls
+
+
+def seed(nexushub, units, files):
+    now = datetime.now(timezone.utc)
+    with nexushub.app.app_context():
+        session = nexushub.db.session
+        session.execute(nexushub.Unit.__table__.insert(), [{'name': f'Unit {i}'} for i in range(units)])
+        for start in range(0, files, 10000):
+            session.execute(nexushub.File.__table__.insert(), [
+                {
+                    'filename': f'note_{i}.pdf',
+                    'type': 'note',
+                    'unit_id': i % units + 1,
+                    'upload_date': now - timedelta(minutes=i),
+                }
+                for i in range(start, min(files, start + 10000))
+            ])
+        session.execute(nexushub.File.__table__.insert(), [
+            {'filename': 'class.xlsx', 'type': 'class_timetable', 'upload_date': now},
+            {'filename': 'exam.xlsx', 'type': 'exam_timetable', 'upload_date': now},
+        ])
+        session.execute(nexushub.Assignment.__table__.insert(), [
+            {'topic': f'Topic {i}', 'remark': 'Benchmark', 'due_date': (now + timedelta(days=i % 90 - 30)).date()}
+            for i in range(1000)
+        ])
+        session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--units', type=int, default=200)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    nexushub = load_app()
+    logging.disable(logging.CRITICAL)
+    seed(nexushub, args.units, args.files)
+
+    File, Assignment = nexushub.File, nexushub.Assignment
+
+    def dashboard():
+        with nexushub.app.app_context():
+            nexushub.load_dashboard()
+
+    def timetables():
+        with nexushub.app.app_context():
+            File.query.filter(File.type.in_(['class_timetable', 'exam_timetable'])).all()
+
+    def live_assignments():
+        with nexushub.app.app_context():
+            today = datetime.now(timezone.utc).date()
+            Assignment.query.filter(Assignment.due_date >= today).order_by(Assignment.due_date).all()
+
+    results = {
+        'files': args.files,
+        'units': args.units,
+        'load_dashboard': time_calls(dashboard, args.iterations),
+        'timetables': time_calls(timetables, args.iterations * 10),
+        'live_assignments': time_calls(live_assignments, args.iterations * 10),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
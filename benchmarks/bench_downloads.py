@@ -0,0 +1,53 @@
+"""Throughput of /Uploads/<filename>: full downloads, ranged resumes and revalidation.
+
+Usage: python benchmarks/bench_downloads.py [--size-mb 5] [--iterations 100]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+from common import load_app, time_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--sendfile-mode', default='', choices=['', 'x-sendfile', 'x-accel'],
+                        help='hand the bytes to a front proxy instead of streaming them from Python')
+    args = parser.parse_args()
+
+    nexushub = load_app()
+    logging.disable(logging.CRITICAL)
+    nexushub.app.config['SENDFILE_MODE'] = args.sendfile_mode
+    nexushub.app.config['USE_X_SENDFILE'] = args.sendfile_mode == 'x-sendfile'
+    size = args.size_mb * 1024 * 1024
+    filename = 'lecture.pdf'
+    with open(os.path.join(nexushub.app.config['UPLOAD_FOLDER'], filename), 'wb') as f:
+        f.write(os.urandom(size))
+    client = nexushub.app.test_client()
+    url = f'/Uploads/{filename}'
+
+    def full():
+        response = client.get(url)
+        assert args.sendfile_mode or len(response.get_data()) == size
+
+    etag = client.get(url).headers['ETag']
+    start = time.perf_counter()
+    results = {
+        'size_mb': args.size_mb,
+        'sendfile_mode': args.sendfile_mode,
+        'full': time_calls(full, args.iterations),
+        'revalidate': time_calls(lambda: client.get(url, headers={'If-None-Match': etag}), args.iterations),
+        'resume_last_mb': time_calls(
+            lambda: client.get(url, headers={'Range': f'bytes={size - 1024 * 1024}-'}), args.iterations),
+    }
+    results['full']['throughput_mb_s'] = round(args.size_mb / (results['full']['mean_ms'] / 1000), 2)
+    results['elapsed_s'] = round(time.perf_counter() - start, 3)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
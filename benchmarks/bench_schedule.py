@@ -0,0 +1,72 @@
+"""Parse a synthetic class timetable and time the schedule endpoints against it.
+
+Also times re-reading the spreadsheet per request, which is what a student
+downloading the file and scanning it amounts to.
+
+Usage: python benchmarks/bench_schedule.py [--units 400] [--requests 300]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+
+from common import load_app, time_calls
+
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+SLOTS = ('07:00-09:00', '09:00-11:00', '11:00-13:00', '14:00-16:00', '16:00-18:00')
+
+
+def seed(nexushub, units):
+    rng = random.Random(42)
+    lines = ['Unit,Day,Time,Venue']
+    for i in range(units):
+        for _ in range(3):
+            lines.append(f'BIT {2000 + i} Unit {i},{rng.choice(DAYS)},{rng.choice(SLOTS)},LAB {rng.randint(1, 20)}')
+    payload = '\n'.join(lines).encode('utf-8')
+    content_hash = hashlib.sha256(payload).hexdigest()
+    path = os.path.join(nexushub.app.config['UPLOAD_FOLDER'], nexushub.blob_name(content_hash, 'class.csv'))
+    with open(path, 'wb') as f:
+        f.write(payload)
+    with nexushub.app.app_context():
+        nexushub.db.session.add(nexushub.File(filename='class.csv', type='class_timetable',
+                                              content_hash=content_hash, size=len(payload)))
+        nexushub.db.session.commit()
+    return path, len(lines) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--units', type=int, default=400)
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    nexushub = load_app()
+    logging.disable(logging.CRITICAL)
+    path, sessions = seed(nexushub, args.units)
+
+    start = time.perf_counter()
+    nexushub.ingest_timetables()
+    parse_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    nexushub.ingest_timetables()
+    unchanged_seconds = time.perf_counter() - start
+
+    client = nexushub.app.test_client()
+    rng = random.Random(7)
+    result = {
+        'sessions': sessions,
+        'parse_s': round(parse_seconds, 3),
+        'unchanged_reparse_s': round(unchanged_seconds, 4),
+        'today': time_calls(lambda: client.get('/schedule/today'), args.requests),
+        'next': time_calls(lambda: client.get(f'/schedule/next?unit=bit+{2000 + rng.randrange(args.units)}'),
+                           args.requests),
+        'reread_file': time_calls(lambda: nexushub.parse_timetable(path), max(1, args.requests // 10)),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Index N synthetic notes (.docx and .csv) and time search queries against them.
+
+Usage: python benchmarks/bench_search.py [--documents 5000] [--workers 2]
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import time
+
+from common import load_app, time_calls
+
+WORDS = ('algorithm binary compiler database encryption firewall gateway hashing index kernel '
+         'latency middleware network protocol query recursion scheduler thread virtualization '
+         'bandwidth cache socket router packet handshake checksum cipher routing subnet').split()
+
+
+def make_document(i, rng):
+    sentences = [' '.join(rng.choice(WORDS) for _ in range(12)) for _ in range(40)]
+    if i % 2:
+        import docx
+        document = docx.Document()
+        for sentence in sentences:
+            document.add_paragraph(sentence)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return f'lecture_{i}.docx', buffer.getvalue()
+    body = '\n'.join(f'{n},{sentence}' for n, sentence in enumerate(sentences))
+    return f'lecture_{i}.csv', body.encode('utf-8')
+
+
+def seed(nexushub, count):
+    rng = random.Random(42)
+    folder = nexushub.app.config['UPLOAD_FOLDER']
+    rows = []
+    for i in range(count):
+        filename, payload = make_document(i, rng)
+        content_hash = hashlib.sha256(payload).hexdigest()
+        with open(os.path.join(folder, nexushub.blob_name(content_hash, filename)), 'wb') as f:
+            f.write(payload)
+        rows.append({'filename': filename, 'type': 'note', 'unit_id': 1,
+                     'content_hash': content_hash, 'size': len(payload)})
+    with nexushub.app.app_context():
+        nexushub.db.session.add(nexushub.Unit(name='Benchmark unit'))
+        nexushub.db.session.execute(nexushub.File.__table__.insert(), rows)
+        nexushub.db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    nexushub = load_app()
+    logging.disable(logging.CRITICAL)
+    nexushub.app.config['SEARCH_WORKERS'] = args.workers
+    seed(nexushub, args.documents)
+
+    start = time.perf_counter()
+    nexushub.index_pending_notes()
+    index_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    nexushub.index_pending_notes()
+    reindex_seconds = time.perf_counter() - start
+
+    client = nexushub.app.test_client()
+    rng = random.Random(7)
+    result = {
+        'documents': args.documents,
+        'workers': args.workers,
+        'index_s': round(index_seconds, 3),
+        'docs_per_s': round(args.documents / index_seconds, 1),
+        'unchanged_reindex_s': round(reindex_seconds, 3),
+        'search': time_calls(lambda: client.get(f'/search?q={rng.choice(WORDS)}+{rng.choice(WORDS)[:4]}'),
+                             args.queries),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Throughput of concurrent note uploads through POST /.
+
+Usage: python benchmarks/bench_uploads.py [--size-mb 10] [--uploads 32] [--concurrency 8]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import load_app, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=int, default=10)
+    parser.add_argument('--uploads', type=int, default=32)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duplicates', action='store_true',
+                        help='upload the same bytes every time to exercise dedup')
+    args = parser.parse_args()
+
+    nexushub = load_app()
+    nexushub.app.config['MAX_CONTENT_LENGTH'] = (args.size_mb + 1) * 1024 * 1024
+    logging.disable(logging.CRITICAL)
+    with nexushub.app.app_context():
+        unit = nexushub.Unit(name='Benchmark unit')
+        nexushub.db.session.add(unit)
+        nexushub.db.session.commit()
+        unit_id = unit.id
+
+    shared = os.urandom(args.size_mb * 1024 * 1024)
+
+    def upload(i):
+        payload = shared if args.duplicates else os.urandom(len(shared))
+        client = nexushub.app.test_client()
+        start = time.perf_counter()
+        response = client.post('/', data={
+            'unit_id': str(unit_id),
+            'note': (io.BytesIO(payload), f'lecture_{i}.pdf'),
+        }, content_type='multipart/form-data')
+        assert response.status_code == 302, response.status_code
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(upload, range(args.uploads)))
+    elapsed = time.perf_counter() - start
+
+    folder = nexushub.app.config['UPLOAD_FOLDER']
+    stored = sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder))
+    print(json.dumps({
+        'uploads': args.uploads,
+        'size_mb': args.size_mb,
+        'concurrency': args.concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_mb_s': round(args.uploads * args.size_mb / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'bytes_on_disk': stored,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
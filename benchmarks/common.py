@@ -0,0 +1,79 @@
+"""Shared helpers for the benchmark scripts.
+
+Each benchmark imports the app against a throwaway SQLite database and upload
+folder so it can run offline without touching instance/nexushub.db. Every in-process
+request comes from one test-client address, so rate limits are off unless
+RATELIMIT_ENABLED is set (bench_abuse.py measures them under gunicorn).
+"""
+import os
+import re
+import socket
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSRF_TOKEN = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+
+def load_app():
+    workdir = tempfile.mkdtemp(prefix='nexushub-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'Uploads')
+    os.environ['OUTPUT_FOLDER'] = os.path.join(workdir, 'outputs')
+    os.environ.setdefault('SECRET_KEY', 'bench-secret')
+    os.environ.setdefault('RATELIMIT_ENABLED', 'false')
+    sys.path.insert(0, ROOT)
+    import app as nexushub
+    nexushub.start_app()
+    return nexushub
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url, timeout=30):
+    import requests
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'{url} did not come up')
+
+
+def form_csrf_token(session, url):
+    """GET a FlaskForm page and return its CSRF token, ready to post back over plain http."""
+    page = session.get(url, timeout=30)
+    token = CSRF_TOKEN.search(page.text).group(1)
+    # The session cookie is marked Secure; let it go back over plain http.
+    for cookie in session.cookies:
+        cookie.secure = False
+    return token
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_calls(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'iterations': iterations,
+        'mean_ms': round(statistics.mean(samples), 3),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+    }
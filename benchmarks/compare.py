@@ -0,0 +1,40 @@
+"""Compare two suite.py reports scenario by scenario.
+
+Usage: python benchmarks/compare.py benchmarks/results/<old>.json benchmarks/results/<new>.json
+"""
+import argparse
+import json
+
+COLUMNS = ('rps', 'p50_ms', 'p99_ms', 'errors')
+
+
+def change(old, new):
+    if old in (None, 0) or new is None:
+        return ''
+    return f'{(new - old) / old * 100:+.1f}%'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('old')
+    parser.add_argument('new')
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    print(f"{'scenario':<15}" + ''.join(f'{column:>28}' for column in COLUMNS))
+    for name in new['scenarios']:
+        before = old['scenarios'].get(name, {})
+        after = new['scenarios'][name]
+        cells = []
+        for column in COLUMNS:
+            a, b = before.get(column), after.get(column)
+            cells.append(f'{a} -> {b} {change(a, b)}'.rjust(28))
+        print(f'{name:<15}' + ''.join(cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Requests/sec of GET / as the gunicorn worker count grows.
+
+Starts the app under gunicorn (gunicorn.conf.py) once per worker count
+against a shared throwaway SQLite database and drives it from several client
+processes. The page cache is disabled so every request renders.
+
+Usage: python benchmarks/load_workers.py [--workers 1 2 4] [--duration 10] [--clients 8]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from common import ROOT, free_port, percentile, wait_ready
+
+
+def drive(url, duration, results):
+    session = requests.Session()
+    latencies = []
+    errors = 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            ok = session.get(url, timeout=10).status_code == 200
+        except requests.RequestException:
+            ok = False
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors += not ok
+    results.put((latencies, errors))
+
+
+def run(workers, args, workdir):
+    port = free_port()
+    env = dict(os.environ,
+               PORT=str(port),
+               WEB_CONCURRENCY=str(workers),
+               LOG_LEVEL='warning',
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+               UPLOAD_FOLDER=os.path.join(workdir, 'Uploads'),
+               OUTPUT_FOLDER=os.path.join(workdir, 'outputs'),
+               DASHBOARD_CACHE_TTL='0',
+               NEWS_API_BASE=f'http://127.0.0.1:{free_port()}',
+               SECRET_KEY='bench-secret')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:start_app()'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f'http://127.0.0.1:{port}/'
+        wait_ready(url)
+        results = multiprocessing.Queue()
+        clients = [multiprocessing.Process(target=drive, args=(url, args.duration, results))
+                   for _ in range(args.clients)]
+        for client in clients:
+            client.start()
+        latencies, errors = [], 0
+        for _ in clients:
+            client_latencies, client_errors = results.get()
+            latencies.extend(client_latencies)
+            errors += client_errors
+        for client in clients:
+            client.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {
+        'workers': workers,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / args.duration, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--duration', type=int, default=10)
+    parser.add_argument('--clients', type=int, default=8)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='nexushub-load-')
+    report = {'cpus': os.cpu_count(), 'runs': [run(workers, args, workdir) for workers in args.workers]}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
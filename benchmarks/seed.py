@@ -0,0 +1,99 @@
+"""Fill a throwaway database and upload folder with a synthetic dataset.
+
+Creates the schema the way `flask --app app init-db` does, without starting
+the app's scheduler, and leaves the search index and parsed timetables up to
+date, so a server started on the same DATABASE_URL/UPLOAD_FOLDER has no
+background catch-up work to do.
+
+Usage: DATABASE_URL=... UPLOAD_FOLDER=... OUTPUT_FOLDER=... \
+    python benchmarks/seed.py [--units 2000] [--notes 3000] [--assignments 5000]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+from common import ROOT
+
+WORDS = ('algorithm binary compiler database encryption firewall gateway hashing index kernel '
+         'latency middleware network protocol query recursion scheduler thread').split()
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+
+
+def note_payload(i, rng):
+    lines = [f'{n},{" ".join(rng.choice(WORDS) for _ in range(10))}' for n in range(20)]
+    return f'lecture_{i}.csv', '\n'.join(lines).encode('utf-8')
+
+
+def write_blob(nexushub, filename, payload):
+    content_hash = hashlib.sha256(payload).hexdigest()
+    with open(os.path.join(nexushub.app.config['UPLOAD_FOLDER'], nexushub.blob_name(content_hash, filename)), 'wb') as f:
+        f.write(payload)
+    return content_hash
+
+
+def seed(nexushub, units, notes, assignments):
+    rng = random.Random(42)
+    today = datetime.now(timezone.utc).date()
+    unit_rows = [{'name': f'UNIT {i:05d} Applied Computing', 'lecturer': f'Dr Lecturer {i % 300}',
+                  'phone': f'+2547{rng.randrange(10 ** 8):08d}', 'email': f'lecturer{i % 300}@example.ac.ke'}
+                 for i in range(units)]
+    note_rows = []
+    stored_notes = []
+    for i in range(notes):
+        filename, payload = note_payload(i, rng)
+        content_hash = write_blob(nexushub, filename, payload)
+        note_rows.append({'filename': filename, 'type': 'note', 'unit_id': rng.randint(1, units),
+                          'content_hash': content_hash, 'size': len(payload)})
+        stored_notes.append(nexushub.blob_name(content_hash, filename))
+    assignment_rows = [{'topic': f'Assignment {i}', 'remark': 'Synthetic benchmark assignment',
+                        'due_date': today + timedelta(days=1 + i % 60), 'posted_date': today}
+                       for i in range(assignments)]
+    timetable = '\n'.join(['Unit,Day,Time,Venue'] + [
+        f'UNIT {i:05d} Applied Computing,{DAYS[i % 5]},{8 + i % 8:02d}:00-{9 + i % 8:02d}:00,LAB {i % 20}'
+        for i in range(min(units, 500))
+    ]).encode('utf-8')
+    timetable_hash = write_blob(nexushub, 'class.csv', timetable)
+
+    with nexushub.app.app_context():
+        db = nexushub.db
+        db.session.execute(db.insert(nexushub.Unit), unit_rows)
+        db.session.execute(db.insert(nexushub.File), note_rows)
+        db.session.execute(db.insert(nexushub.Assignment), assignment_rows)
+        db.session.add(nexushub.File(filename='class.csv', type='class_timetable',
+                                     content_hash=timetable_hash, size=len(timetable)))
+        db.session.commit()
+    nexushub.app.config['SEARCH_BATCH_SIZE'] = 1000
+    nexushub.index_pending_notes()
+    nexushub.ingest_timetables()
+    return {'units': units, 'notes': notes, 'assignments': assignments, 'stored_notes': stored_notes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--units', type=int, default=2000)
+    parser.add_argument('--notes', type=int, default=3000)
+    parser.add_argument('--assignments', type=int, default=5000)
+    parser.add_argument('--manifest', help='write the stored note names here as JSON')
+    args = parser.parse_args()
+
+    os.environ.setdefault('SECRET_KEY', 'bench-secret')
+    os.environ['SEARCH_WORKERS'] = '0'
+    sys.path.insert(0, ROOT)
+    import app as nexushub
+    logging.disable(logging.CRITICAL)
+    nexushub.bootstrap_database()
+    os.makedirs(nexushub.app.config['UPLOAD_FOLDER'], exist_ok=True)
+    result = seed(nexushub, args.units, args.notes, args.assignments)
+    if args.manifest:
+        with open(args.manifest, 'w') as f:
+            json.dump(result, f)
+    print(json.dumps({key: value for key, value in result.items() if key != 'stored_notes'}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Local stand-ins for the Telegram Bot API and NewsAPI.
+
+Each stub is a threaded HTTP server on 127.0.0.1 that answers like the real
+service after an optional fixed delay, so outbound calls can be benchmarked
+without the network. Point TELEGRAM_API_BASE / NEWS_API_BASE at `stub.url`.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def news_body():
+    return {
+        'status': 'ok',
+        'articles': [
+            {
+                'title': f'Benchmark headline {i}',
+                'description': 'Synthetic article served by the NewsAPI stub.',
+                'url': f'https://example.com/articles/{i}',
+                'source': {'name': 'Stub News'},
+            }
+            for i in range(5)
+        ],
+    }
+
+
+class QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Pooled connections are dropped when the app shuts down; not worth a traceback.
+        pass
+
+
+class StubServer:
+    def __init__(self, body, delay=0.0, status=200):
+        self.respond(body, status)
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _reply(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self.rfile.read(length)
+                with stub._lock:
+                    stub.calls += 1
+                if stub.delay:
+                    time.sleep(stub.delay)
+                self.send_response(stub.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(stub.body)))
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            do_GET = do_POST = _reply
+
+            def log_message(self, *args):
+                pass
+
+        self.server = QuietServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def respond(self, body, status=200):
+        """Answer later requests with `body` and HTTP `status`."""
+        self.body = json.dumps(body).encode('utf-8')
+        self.status = status
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def telegram_stub(delay=0.0):
+    return StubServer({'ok': True, 'result': {'message_id': 1}}, delay).start()
+
+
+def news_stub(delay=0.0):
+    return StubServer(news_body(), delay).start()
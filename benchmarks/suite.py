@@ -0,0 +1,239 @@
+"""Offline load test of the hub's hot paths, written to a JSON report.
+
+Starts local Telegram/NewsAPI stubs, seeds a throwaway SQLite database and
+upload folder (seed.py), runs the app under gunicorn with gunicorn.conf.py and
+drives each scenario from --concurrency client threads for --duration seconds:
+
+  index          GET /
+  upload         POST / with a new note file
+  download       GET /Uploads/<name> of a seeded note
+  send_telegram  GET and POST /send_telegram, delivered to the Telegram stub;
+                 posts refused because the send queue is full count as errors
+  socketio       Socket.IO connect and disconnect over long-polling
+
+Long-polling needs every request of a client to reach the same worker, so
+keep --workers 1 for the socketio scenario.
+
+Compare two reports with benchmarks/compare.py.
+
+Usage: python benchmarks/suite.py [--scenarios index download ...] [--duration 10]
+           [--concurrency 8] [--workers 1] [--output report.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from common import ROOT, form_csrf_token, free_port, percentile, wait_ready
+from stubs import news_stub, telegram_stub
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Client:
+    """One simulated user: a requests session plus whatever a scenario needs."""
+
+    def __init__(self, base):
+        self.base = base
+        self.session = requests.Session()
+        self.rng = random.Random()
+
+
+def index(client, manifest):
+    return client.session.get(f'{client.base}/', timeout=30).status_code == 200
+
+
+def upload(client, manifest):
+    payload = '\n'.join(f'{n},{client.rng.random()}' for n in range(200)).encode('utf-8')
+    response = client.session.post(
+        f'{client.base}/',
+        data={'unit_id': str(client.rng.randint(1, manifest['units']))},
+        files={'note': (f'upload_{client.rng.randrange(10 ** 9)}.csv', payload)},
+        allow_redirects=False, timeout=30)
+    return response.status_code == 302
+
+
+def download(client, manifest):
+    name = client.rng.choice(manifest['stored_notes'])
+    response = client.session.get(f'{client.base}/Uploads/{name}', timeout=30)
+    return response.status_code == 200 and len(response.content) > 0
+
+
+def send_telegram(client, manifest):
+    # Open the form and submit it, like a user would. A fresh session each time
+    # keeps undisplayed flash messages from piling up in the cookie.
+    client.session.cookies.clear()
+    csrf_token = form_csrf_token(client.session, f'{client.base}/send_telegram')
+    response = client.session.post(f'{client.base}/send_telegram',
+                                   data={'csrf_token': csrf_token, 'message': 'Benchmark message'},
+                                   allow_redirects=False, timeout=30)
+    return response.status_code == 302 and 'telegram_job=' in response.headers.get('Location', '')
+
+
+def socketio_connect(client, manifest):
+    import socketio
+    sio = socketio.Client(reconnection=False)
+    sio.connect(client.base, transports=['polling'], wait_timeout=10)
+    sio.disconnect()
+    return True
+
+
+SCENARIOS = {
+    'index': index,
+    'upload': upload,
+    'download': download,
+    'send_telegram': send_telegram,
+    'socketio': socketio_connect,
+}
+
+
+def drive(base, scenario, manifest, concurrency, duration, warmup):
+    """Run `scenario` from `concurrency` threads; the first `warmup` seconds are not recorded."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    started = time.perf_counter()
+    record_from = started + warmup
+    deadline = record_from + duration
+
+    def worker():
+        client = Client(base)
+        local_latencies, local_errors = [], 0
+        while True:
+            start = time.perf_counter()
+            if start >= deadline:
+                break
+            try:
+                ok = scenario(client, manifest)
+            except Exception:
+                ok = False
+            if start >= record_from:
+                local_latencies.append((time.perf_counter() - start) * 1000)
+                local_errors += not ok
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if not latencies:
+        return {'requests': 0, 'errors': errors[0]}
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': round(len(latencies) / duration, 1),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p90_ms': round(percentile(latencies, 90), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(max(latencies), 3),
+    }
+
+
+def git_revision():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                             cwd=ROOT, text=True).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, dirty
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--duration', type=float, default=10, help='seconds recorded per scenario')
+    parser.add_argument('--warmup', type=float, default=2, help='seconds run before recording starts')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=1, help='gunicorn worker processes')
+    parser.add_argument('--units', type=int, default=2000)
+    parser.add_argument('--notes', type=int, default=3000)
+    parser.add_argument('--assignments', type=int, default=5000)
+    parser.add_argument('--stub-delay-ms', type=float, default=50, help='latency of the Telegram/NewsAPI stubs')
+    parser.add_argument('--output', help='report path (default benchmarks/results/<commit>.json)')
+    args = parser.parse_args()
+
+    commit, dirty = git_revision()
+    workdir = tempfile.mkdtemp(prefix='nexushub-suite-')
+    telegram = telegram_stub(args.stub_delay_ms / 1000)
+    news = news_stub(args.stub_delay_ms / 1000)
+    port = free_port()
+    env = dict(os.environ,
+               PORT=str(port),
+               WEB_CONCURRENCY=str(args.workers),
+               LOG_LEVEL='warning',
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'suite.db')}",
+               UPLOAD_FOLDER=os.path.join(workdir, 'Uploads'),
+               OUTPUT_FOLDER=os.path.join(workdir, 'outputs'),
+               TELEGRAM_API_BASE=telegram.url,
+               NEWS_API_BASE=news.url,
+               RATELIMIT_ENABLED='false',  # Every client shares 127.0.0.1
+               SECRET_KEY='bench-secret')
+
+    manifest_path = os.path.join(workdir, 'manifest.json')
+    print(f'Seeding {workdir} ...', file=sys.stderr)
+    seeding = subprocess.run([sys.executable, os.path.join(BENCH_DIR, 'seed.py'), '--units', str(args.units),
+                              '--notes', str(args.notes), '--assignments', str(args.assignments),
+                              '--manifest', manifest_path],
+                             cwd=ROOT, env=env, capture_output=True, text=True)
+    if seeding.returncode != 0:
+        sys.exit(f'Seeding failed:\n{seeding.stderr}')
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:start_app()'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+    results = {}
+    try:
+        wait_ready(f'{base}/test')
+        for name in args.scenarios:
+            print(f'Running {name} ...', file=sys.stderr)
+            results[name] = drive(base, SCENARIOS[name], manifest, args.concurrency, args.duration, args.warmup)
+    finally:
+        # SIGINT is gunicorn's quick shutdown; SIGTERM would wait out open long-polls.
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        telegram.stop()
+        news.stop()
+
+    report = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'args': vars(args),
+        },
+        'dataset': {key: manifest[key] for key in ('units', 'notes', 'assignments')},
+        'outbound_calls': {'telegram': telegram.calls, 'news': news.calls},
+        'scenarios': results,
+    }
+    output = args.output or os.path.join(BENCH_DIR, 'results', f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f'Report written to {output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""Bulk import and export of units and assignments.
+
+read_frame() loads a CSV/XLSX upload or a JSON array into a DataFrame, and
+validate_units()/validate_assignments() check every row with column-wide
+pandas operations instead of one regex call per field. They return the clean
+records plus a list of per-row errors; row numbers are 1-based positions of
+the record in the input, not counting a header line.
+
+stream_csv()/stream_json() turn an iterable of result rows into text chunks
+for a streaming response.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+
+import bleach
+
+UNIT_FIELDS = ('name', 'lecturer', 'phone', 'email')
+ASSIGNMENT_FIELDS = ('topic', 'remark', 'due_date')
+COLUMN_ALIASES = {
+    'unit': 'name', 'unit name': 'name', 'unit_name': 'name',
+    'lecturer name': 'lecturer', 'phone number': 'phone', 'e-mail': 'email',
+    'title': 'topic', 'description': 'remark', 'due': 'due_date', 'due date': 'due_date',
+}
+# Same rules as validate_phone()/validate_email() in app.py
+PHONE_PATTERN = r'\+?\d{7,16}'
+EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+MARKUP_PATTERN = r'[<>&]'
+MAX_ROWS = 100_000
+EXPORT_CHUNK_ROWS = 1000
+
+
+class BulkError(ValueError):
+    """The payload as a whole could not be read."""
+
+
+def read_frame(source, fmt):
+    """Load `source` (a file stream, or a parsed JSON list for fmt='json') into a DataFrame of strings."""
+    import pandas as pd
+    try:
+        if fmt == 'json':
+            if not isinstance(source, list) or not all(isinstance(item, dict) for item in source):
+                raise BulkError('Expected a JSON array of objects')
+            frame = pd.DataFrame.from_records(source)
+        elif fmt == 'csv':
+            frame = pd.read_csv(source, dtype=object, keep_default_na=False)
+        elif fmt in ('xlsx', 'xls'):
+            frame = pd.read_excel(source, dtype=object, keep_default_na=False)
+        else:
+            raise BulkError('Unsupported format, use .csv, .xlsx, .xls or JSON')
+    except BulkError:
+        raise
+    except Exception as e:
+        raise BulkError(f'Could not read upload: {str(e)}')
+    if len(frame) > MAX_ROWS:
+        raise BulkError(f'Too many rows ({len(frame)}), the limit is {MAX_ROWS}')
+    frame.columns = [normalize_column(column) for column in frame.columns]
+    frame = frame.reset_index(drop=True)
+    if fmt == 'json':
+        # Objects in a JSON array may each carry different keys; remember which.
+        frame.attrs['keys'] = [frozenset(normalize_column(key) for key in item) for item in source]
+    return frame
+
+
+def normalize_column(column):
+    column = str(column).strip().lower()
+    return COLUMN_ALIASES.get(column, column)
+
+
+def clean_column(frame, field):
+    """Stripped strings with blanks as NA; only values containing markup go through bleach."""
+    import pandas as pd
+    if field not in frame:
+        return pd.Series(pd.NA, index=frame.index, dtype='string')
+    values = frame[field].astype('string').str.strip()
+    values = values.mask(values == '')
+    markup = values.str.contains(MARKUP_PATTERN, regex=True, na=False)
+    if markup.any():
+        values[markup] = values[markup].map(lambda value: bleach.clean(value, tags=[], attributes={}))
+    return values
+
+
+class RowErrors:
+    def __init__(self, index):
+        import pandas as pd
+        self.invalid = pd.Series(False, index=index)
+        self.errors = []
+
+    def flag(self, mask, field, message):
+        mask = mask.fillna(False).astype(bool)
+        for position in mask.index[mask]:
+            self.errors.append({'row': int(position) + 1, 'field': field, 'error': message})
+        self.invalid |= mask
+
+    def sorted(self):
+        return sorted(self.errors, key=lambda error: error['row'])
+
+
+def check_text(columns, errors, field, max_length, required):
+    values = columns[field]
+    if required:
+        errors.flag(values.isna(), field, 'is required')
+    errors.flag(values.str.len() > max_length, field, f'is longer than {max_length} characters')
+
+
+def to_records(columns, fields, keep):
+    import pandas as pd
+    frame = pd.DataFrame({field: columns[field] for field in fields})[keep]
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def validate_units(frame):
+    """Return (records, errors). A name appearing twice keeps its last row."""
+    columns = {field: clean_column(frame, field) for field in UNIT_FIELDS}
+    errors = RowErrors(frame.index)
+    check_text(columns, errors, 'name', 100, required=True)
+    check_text(columns, errors, 'lecturer', 100, required=False)
+    check_text(columns, errors, 'email', 100, required=False)
+    phone, email = columns['phone'], columns['email']
+    errors.flag(phone.notna() & ~phone.str.fullmatch(PHONE_PATTERN).fillna(False), 'phone', 'is not a valid phone number')
+    errors.flag(email.notna() & ~email.str.fullmatch(EMAIL_PATTERN).fillna(False), 'email', 'is not a valid email address')
+    keep = ~errors.invalid & ~columns['name'].str.lower().duplicated(keep='last')
+    # Fields missing from the upload are left out so an upsert keeps the stored
+    # values: whole columns for files, and each object's own keys for JSON.
+    present = [field for field in UNIT_FIELDS if field == 'name' or field in frame]
+    records = to_records(columns, present, keep)
+    keys = frame.attrs.get('keys')
+    if keys is not None:
+        records = [{field: value for field, value in record.items() if field == 'name' or field in keys[row]}
+                   for row, record in zip(frame.index[keep], records)]
+    return records, errors.sorted()
+
+
+def validate_assignments(frame, today):
+    """Return (records, errors). Due dates may be YYYY-MM-DD or DD/MM/YYYY and must not be past."""
+    import pandas as pd
+    columns = {field: clean_column(frame, field) for field in ASSIGNMENT_FIELDS}
+    errors = RowErrors(frame.index)
+    check_text(columns, errors, 'topic', 100, required=True)
+    check_text(columns, errors, 'remark', 200, required=True)
+    raw = columns['due_date']
+    due = pd.to_datetime(raw, format='ISO8601', errors='coerce')
+    retry = due.isna() & raw.notna()
+    if retry.any():
+        due[retry] = pd.to_datetime(raw[retry], format='%d/%m/%Y', errors='coerce')
+    errors.flag(raw.isna(), 'due_date', 'is required')
+    errors.flag(raw.notna() & due.isna(), 'due_date', 'is not a date (use YYYY-MM-DD or DD/MM/YYYY)')
+    # Compare timestamps: an all-NaT column has no .dt.date objects to compare with a date.
+    errors.flag(due < pd.Timestamp(today), 'due_date', 'is in the past')
+    columns['due_date'] = due.dt.date
+    key = columns['topic'].str.lower() + '|' + due.astype('string')
+    keep = ~errors.invalid & ~key.duplicated(keep='last')
+    return to_records(columns, ASSIGNMENT_FIELDS, keep), errors.sorted()
+
+
+def export_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for count, row in enumerate(rows, 1):
+        writer.writerow([export_value(value) for value in row])
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_json(fields, rows):
+    chunk = ['[']
+    for count, row in enumerate(rows):
+        record = {field: export_value(value) for field, value in zip(fields, row)}
+        chunk.append(('\n' if count == 0 else ',\n') + json.dumps(record))
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield ''.join(chunk)
+            chunk = []
+    chunk.append('\n]\n')
+    yield ''.join(chunk)
@@ -0,0 +1,26 @@
+# Gunicorn settings shared by the Procfile and the Docker image.
+#
+# WEB_CONCURRENCY sets the number of worker processes. With more than one
+# worker, scheduled jobs are still run by a single elected worker (see
+# scheduler_heartbeat in app.py), and Socket.IO needs SOCKETIO_MESSAGE_QUEUE
+# (e.g. redis://...) so events emitted in one worker reach clients connected
+# to another. Socket.IO clients must connect over websocket, or the load
+# balancer must use sticky sessions, because long-polling requests from one
+# client cannot be spread across workers. Rate limits are likewise counted per
+# worker unless RATELIMIT_STORAGE_URI points at shared storage (redis://...).
+# Telegram delivery statuses are shared through the database, and so is the
+# rendered dashboard cache's invalidation once WEB_CONCURRENCY is above 1.
+# Several machines with one worker each need DASHBOARD_CACHE_SHARED=true.
+#
+# Serve 'app:start_app()', which upgrades the database schema if needed (one
+# worker at a time, behind a lock) and starts each worker's scheduler and
+# caches. `flask --app app init-db` does the schema and default admin ahead of
+# time, keeping that off the first start. start_app() is not an app factory:
+# app.py builds the Flask app from the environment when it is imported, so
+# every setting has to be in the environment gunicorn starts with.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+worker_class = 'eventlet'
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+loglevel = os.environ.get('LOG_LEVEL', 'info')
@@ -0,0 +1,218 @@
+"""In-process metrics with Prometheus text exposition, plus a slow-request profiler.
+
+Counter, Gauge and Histogram are small thread-safe stand-ins for the
+prometheus_client types; Registry.render() produces the text format served by
+/metrics. Values live in the process that recorded them, so with several
+gunicorn workers each one reports its own series.
+
+SlowRequestProfiler samples the running Python stack on a wall-clock timer
+(SIGALRM) and, for a request slower than its threshold, writes the samples
+taken while it was in flight as folded stacks ("a;b;c 12"), the input format
+of flamegraph.pl and speedscope. Samples come from the main thread, which is
+where every request runs under the eventlet worker; concurrent requests share
+the sample stream, so their stacks can appear in each other's dumps.
+"""
+import collections
+import logging
+import math
+import os
+import re
+import signal
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self):
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f'{self.name}{format_labels(self.labelnames, key)} {format_value(value)}'
+                for key, value in sorted(values.items())]
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    samples = Counter.samples
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = format_labels(self.labelnames, key, [('le', format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs):
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs):
+        return self.register(Histogram(*args, **kwargs))
+
+    def add_collector(self, func):
+        """Call func() before every render, e.g. to copy stats into gauges."""
+        self._collectors.append(func)
+        return func
+
+    def render(self):
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"Metrics collector {collector.__name__} failed: {str(e)}")
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+class SlowRequestProfiler:
+    def __init__(self, directory, threshold_seconds, interval_seconds=0.005, max_samples=50_000):
+        self.directory = directory
+        self.threshold = threshold_seconds
+        self.interval = interval_seconds
+        self.enabled = False
+        self._samples = collections.deque(maxlen=max_samples)
+
+    def start(self):
+        """Install the sampling timer; must run on the main thread. Returns whether it is on."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            signal.signal(signal.SIGALRM, self._sample)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        except (ValueError, OSError, AttributeError) as e:
+            logger.warning(f"Slow request profiler not started: {str(e)}")
+            return False
+        self.enabled = True
+        return True
+
+    def stop(self):
+        if self.enabled:
+            signal.setitimer(signal.ITIMER_REAL, 0, 0)
+            self.enabled = False
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+            frame = frame.f_back
+        self._samples.append((time.monotonic(), ';'.join(reversed(stack))))
+
+    def dump(self, name, started, duration):
+        """Write the samples since `started` (time.monotonic()) to a .folded file and return its path."""
+        if not self.enabled or duration < self.threshold:
+            return None
+        stacks = collections.Counter(stack for taken, stack in list(self._samples) if taken >= started)
+        if not stacks:
+            return None
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'request'
+        path = os.path.join(self.directory, f'{time.strftime("%Y%m%d-%H%M%S")}-{int(duration * 1000)}ms-{slug}.folded')
+        with open(path, 'w') as f:
+            for stack, count in stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        return path
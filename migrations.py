@@ -0,0 +1,217 @@
+"""In-place schema upgrades for databases created before a model change.
+
+db.create_all() only creates missing tables, so columns whose type changed and
+indexes added to existing tables are brought up to date here. Every step checks
+the live schema first and is safe to run on every start.
+
+Legacy dates that cannot be parsed become NULL. In a column the model declares
+NOT NULL such a row could never be shown or purged, so it is moved out of the
+way before the constraint is put back: the whole row, as JSON, and the
+original date string are kept in the migration_quarantine table, where they
+can be fixed by hand and copied back.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Date, DateTime, Integer, MetaData, String, Table, Text, inspect, insert, text, update
+from sqlalchemy.schema import CreateTable
+
+logger = logging.getLogger(__name__)
+
+LEGACY_DATE_FORMAT = '%d/%m/%Y'
+BACKFILL_BATCH_SIZE = 1000
+
+# (table, column, target type) for columns that used to hold dd/mm/YYYY strings.
+DATE_COLUMNS = [
+    ('assignment', 'due_date', Date),
+    ('assignment', 'posted_date', Date),
+    ('file', 'upload_date', DateTime),
+]
+
+# Rows a migration could not keep in their table. Not a model: nothing in the
+# app reads it, it is there for whoever repairs the data.
+QUARANTINE = Table(
+    'migration_quarantine', MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('table_name', String(50), nullable=False),
+    Column('row_id', Integer, nullable=False),
+    Column('column_name', String(50), nullable=False),
+    Column('original_value', String(200), nullable=True),
+    Column('row_data', Text, nullable=True),
+    Column('quarantined_at', DateTime, nullable=False),
+)
+
+
+def quarantine_values(conn, table, column, rejected):
+    """Record the original strings of `rejected` [(row_id, value)] before the column swap drops them."""
+    QUARANTINE.create(conn, checkfirst=True)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    conn.execute(insert(QUARANTINE), [
+        {'table_name': table, 'row_id': row_id, 'column_name': column,
+         'original_value': str(value)[:200], 'quarantined_at': now}
+        for row_id, value in rejected
+    ])
+
+
+def quarantine_rows(conn, table, column, rows):
+    """Keep full copies of rows about to be deleted for lacking `column`."""
+    QUARANTINE.create(conn, checkfirst=True)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for row in rows:
+        row_data = json.dumps(dict(row), default=str)
+        match = ((QUARANTINE.c.table_name == table) & (QUARANTINE.c.row_id == row['id'])
+                 & (QUARANTINE.c.column_name == column) & QUARANTINE.c.row_data.is_(None))
+        if not conn.execute(update(QUARANTINE).where(match).values(row_data=row_data)).rowcount:
+            conn.execute(insert(QUARANTINE).values(table_name=table, row_id=row['id'], column_name=column,
+                                                   row_data=row_data, quarantined_at=now))
+
+
+def parse_legacy_date(value, target):
+    if value is None:
+        return None
+    try:
+        parsed = datetime.strptime(value.strip(), LEGACY_DATE_FORMAT)
+    except ValueError:
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    return parsed.date() if target is Date else parsed
+
+
+def is_legacy_string_column(engine, table, column):
+    inspector = inspect(engine)
+    if table not in inspector.get_table_names():
+        return False
+    for info in inspector.get_columns(table):
+        if info['name'] == column:
+            try:
+                return info['type'].python_type is str
+            except NotImplementedError:
+                return False
+    return False
+
+
+def migrate_date_column(engine, table, column, target, batch_size=BACKFILL_BATCH_SIZE):
+    """Convert a dd/mm/YYYY string column to a native Date/DateTime column.
+
+    A new column is added, filled in primary-key batches so no single
+    transaction touches the whole table, and then swapped in for the old one.
+    """
+    staging = f'{column}_native'
+    type_sql = target().compile(dialect=engine.dialect)
+    with engine.begin() as conn:
+        if staging not in {info['name'] for info in inspect(conn).get_columns(table)}:
+            conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {staging} {type_sql}'))
+
+    last_id = 0
+    converted = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(f'SELECT id, {column} FROM "{table}" WHERE id > :last_id ORDER BY id LIMIT :limit'),
+                {'last_id': last_id, 'limit': batch_size},
+            ).all()
+            if not rows:
+                break
+            params = []
+            rejected = []
+            for row_id, value in rows:
+                parsed = parse_legacy_date(value, target)
+                if parsed is None and value is not None:
+                    logger.warning(f"Unparseable legacy date {value!r} in {table}.{column} id {row_id}, "
+                                   f"leaving it empty; the original is kept in {QUARANTINE.name}")
+                    rejected.append((row_id, value))
+                params.append({'id': row_id, 'value': parsed})
+            if rejected:
+                quarantine_values(conn, table, column, rejected)
+            conn.execute(text(f'UPDATE "{table}" SET {staging} = :value WHERE id = :id'), params)
+        last_id = rows[-1][0]
+        converted += len(rows)
+
+    with engine.begin() as conn:
+        conn.execute(text(f'ALTER TABLE "{table}" DROP COLUMN {column}'))
+        conn.execute(text(f'ALTER TABLE "{table}" RENAME COLUMN {staging} TO {column}'))
+    logger.info(f"Migrated {table}.{column} to {type_sql} ({converted} rows)")
+
+
+def rebuild_sqlite_table(conn, table):
+    """Recreate `table` from its model definition, keeping the rows.
+
+    SQLite cannot change a column's constraints in place. Indexes are dropped
+    with the old table and recreated by create_missing_indexes().
+    """
+    copy = MetaData()
+    for other in table.metadata.sorted_tables:
+        if other is not table:
+            other.to_metadata(copy)
+    staging = table.to_metadata(copy, name=f'{table.name}_rebuild')
+    live = {info['name'] for info in inspect(conn).get_columns(table.name)}
+    columns = ', '.join(column.name for column in table.columns if column.name in live)
+    conn.execute(CreateTable(staging))
+    conn.execute(text(f'INSERT INTO "{staging.name}" ({columns}) SELECT {columns} FROM "{table.name}"'))
+    conn.execute(text(f'DROP TABLE "{table.name}"'))
+    conn.execute(text(f'ALTER TABLE "{staging.name}" RENAME TO "{table.name}"'))
+
+
+def restore_not_null(engine, metadata, table_name, column):
+    """Put back the NOT NULL that migrate_date_column's column swap leaves off."""
+    table = metadata.tables.get(table_name)
+    if table is None or table.c[column].nullable:
+        return
+    inspector = inspect(engine)
+    if table_name not in inspector.get_table_names():
+        return
+    live = {info['name']: info for info in inspector.get_columns(table_name)}
+    if column not in live or not live[column]['nullable']:
+        return
+    with engine.begin() as conn:
+        # SELECT *: the live table may still lack columns the model has.
+        empty = conn.execute(text(f'SELECT * FROM "{table_name}" WHERE {column} IS NULL')).mappings().all()
+        if empty:
+            # Copied in the same transaction as the DELETE, so a row is never only gone.
+            quarantine_rows(conn, table_name, column, empty)
+            logger.warning(f"Moved {len(empty)} {table_name} rows without a {column} to {QUARANTINE.name}: "
+                           f"ids {[row['id'] for row in empty]}")
+            conn.execute(text(f'DELETE FROM "{table_name}" WHERE {column} IS NULL'))
+        if engine.dialect.name == 'sqlite':
+            rebuild_sqlite_table(conn, table)
+        else:
+            conn.execute(text(f'ALTER TABLE "{table_name}" ALTER COLUMN {column} SET NOT NULL'))
+    logger.info(f"Restored NOT NULL on {table_name}.{column}")
+
+
+def add_missing_columns(engine, metadata):
+    """Add nullable model columns that an older table does not have yet."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {info['name'] for info in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            type_sql = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN {column.name} {type_sql}'))
+            logger.info(f"Added column {table.name}.{column.name}")
+
+
+def create_missing_indexes(engine, metadata):
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def run_migrations(engine, metadata):
+    for table, column, target in DATE_COLUMNS:
+        if is_legacy_string_column(engine, table, column):
+            migrate_date_column(engine, table, column, target)
+    # Only once every column is converted: a SQLite rebuild copies the rows
+    # into the model's types, after which a legacy column no longer looks legacy.
+    for table, column, target in DATE_COLUMNS:
+        restore_not_null(engine, metadata, table, column)
+    add_missing_columns(engine, metadata)
+    create_missing_indexes(engine, metadata)
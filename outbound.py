@@ -0,0 +1,145 @@
+"""Shared client for outbound HTTP calls (Telegram, NewsAPI).
+
+One pooled requests.Session keeps connections to each host alive between
+calls, failed requests are retried with exponential backoff, and a semaphore
+per host caps how many calls can be in flight to it at once. SendQueue runs
+calls on background workers so a request handler can hand work off and
+return straight away.
+"""
+import logging
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class OutboundClient:
+    def __init__(self, pool_size=10, retries=3, backoff=0.5, per_host_limit=4, timeout=10, observer=None):
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+        # observer(method, host, status, seconds) is told about every call;
+        # seconds covers any retries, status is 'error' if nothing came back.
+        self.observer = observer
+        self.session = requests.Session()
+        # read=0: a POST that timed out mid-response may already have been
+        # delivered, so only connection failures and retryable statuses repeat.
+        retry = Retry(
+            total=retries,
+            read=0,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+        with slot:
+            yield
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        with self._slot(url):
+            start = time.perf_counter()
+            status = 'error'
+            try:
+                response = self.session.request(method, url, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                if self.observer:
+                    self.observer(method, urlsplit(url).netloc, status, time.perf_counter() - start)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class SendQueue:
+    """Bounded queue of outbound jobs drained by background workers.
+
+    Workers are plain threads, like the APScheduler jobs; under gunicorn's
+    eventlet worker threading is monkey-patched so they run as green threads.
+    """
+
+    def __init__(self, maxsize=100, workers=2, start_task=None):
+        self._jobs = queue.Queue(maxsize=maxsize)
+        self._workers = workers
+        self._start_task = start_task or self._start_thread
+        self._started = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _start_thread(target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        return thread
+
+    def _ensure_started(self):
+        with self._lock:
+            if not self._started:
+                for _ in range(self._workers):
+                    self._start_task(self._run)
+                self._started = True
+
+    def submit(self, func, *args, on_done=None):
+        """Queue func(*args); return a job id, or None when the queue is full.
+
+        on_done(job_id, result, error) is called from the worker afterwards.
+        """
+        self._ensure_started()
+        job_id = uuid.uuid4().hex
+        try:
+            self._jobs.put_nowait((job_id, func, args, on_done))
+        except queue.Full:
+            return None
+        return job_id
+
+    def pending(self):
+        return self._jobs.qsize()
+
+    def join(self):
+        self._jobs.join()
+
+    def _run(self):
+        while True:
+            job_id, func, args, on_done = self._jobs.get()
+            result, error = None, None
+            try:
+                result = func(*args)
+            except Exception as e:
+                error = e
+                logger.error(f"Outbound job {job_id} failed: {str(e)}")
+            try:
+                if on_done:
+                    on_done(job_id, result, error)
+            except Exception as e:
+                logger.error(f"Outbound job {job_id} callback failed: {str(e)}")
+            finally:
+                self._jobs.task_done()
@@ -0,0 +1,131 @@
+"""Server-side cache for rendered pages.
+
+Pages are stored whole, keyed by name, and expire after a TTL or when a write
+handler calls invalidate(). Each entry carries a strong ETag derived from the
+rendered body plus the time of the last invalidation, so conditional requests
+can be answered with 304 without rendering the template or touching the DB.
+
+With several worker processes each holds its own entries, so a cache can be
+given a shared generation counter (see SharedGeneration). Lookups then read
+the counter at most once per sync_interval seconds and drop local entries
+once another process has invalidated. Without one, a hit touches nothing.
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class CachedPage:
+    def __init__(self, body, last_modified, expires_at):
+        self.body = body
+        self.etag = hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+
+class SharedGeneration:
+    """Invalidation counter every process can see. Subclasses implement:
+
+    read() -> (generation, changed_at), or None when it cannot be read
+    bump() -> the (generation, changed_at) after adding one, or None on failure
+
+    changed_at is an aware datetime, or None before the first bump.
+    """
+
+    def read(self):
+        raise NotImplementedError
+
+    def bump(self):
+        raise NotImplementedError
+
+
+class PageCache:
+    def __init__(self, ttl=300, shared=None, sync_interval=1.0):
+        self.ttl = ttl
+        self.shared = shared
+        self.sync_interval = sync_interval
+        self._next_sync = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self._generation = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _adopt(self, current):
+        """Catch up with the shared generation; caller holds the lock."""
+        generation, changed_at = current
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+            if changed_at is not None:
+                self.last_modified = changed_at.replace(microsecond=0)
+
+    def _sync(self):
+        """Read the shared generation if it is due; False when it could not be read."""
+        if self.shared is None or time.monotonic() < self._next_sync:
+            return True
+        current = self.shared.read()
+        if current is None:
+            return False
+        with self._lock:
+            self._adopt(current)
+            self._next_sync = time.monotonic() + self.sync_interval
+        return True
+
+    def get(self, key):
+        synced = self._sync()
+        with self._lock:
+            if not synced:
+                # Cannot tell whether another process invalidated: render.
+                self.misses += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, key, body, generation=None):
+        """Store a rendered body. Pass the generation() read before rendering
+        so a page built from data that was invalidated mid-render is dropped."""
+        with self._lock:
+            entry = CachedPage(body, self.last_modified, time.monotonic() + self.ttl)
+            if generation is None or generation == self._generation:
+                self._entries[key] = entry
+            return entry
+
+    def invalidate(self):
+        current = self.shared.bump() if self.shared else None
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+            if current is not None:
+                self._adopt(current)
+            else:
+                # Pages rendered before this call can no longer be stored.
+                self._generation += 1
+                self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'invalidations': self.invalidations,
+                'generation': self._generation,
+                'shared': self.shared is not None,
+                'entries': len(self._entries),
+                'ttl': self.ttl,
+                'last_modified': self.last_modified.isoformat(),
+            }
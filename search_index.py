@@ -0,0 +1,180 @@
+"""Full-text search over the contents of uploaded notes.
+
+Text is pulled out of .pdf, .docx, .xlsx/.xls and .csv files by
+extract_text(), which is a plain top-level function so it can run in a
+process pool. The text goes into an inverted index keyed by File.id: an FTS5
+virtual table on SQLite, or a table with a generated tsvector column and a GIN
+index on PostgreSQL. Each indexed row remembers the content hash it was built
+from, so unchanged files are skipped on the next pass.
+"""
+import html
+import logging
+import os
+import re
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_CHARS = 2_000_000
+HIGHLIGHT_START = '[[['
+HIGHLIGHT_END = ']]]'
+QUERY_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def extract_text(path):
+    """Return the plain text of a note file, or '' if it cannot be read."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == '.pdf':
+            from PyPDF2 import PdfReader
+            reader = PdfReader(path)
+            body = '\n'.join(page.extract_text() or '' for page in reader.pages)
+        elif extension == '.docx':
+            import docx
+            document = docx.Document(path)
+            parts = [paragraph.text for paragraph in document.paragraphs]
+            for table in document.tables:
+                for row in table.rows:
+                    parts.append(' '.join(cell.text for cell in row.cells))
+            body = '\n'.join(parts)
+        elif extension in ('.xlsx', '.xls'):
+            import pandas as pd
+            sheets = pd.read_excel(path, sheet_name=None, header=None, dtype=str)
+            body = '\n'.join(frame.fillna('').to_string(index=False, header=False) for frame in sheets.values())
+        elif extension == '.csv':
+            import pandas as pd
+            frame = pd.read_csv(path, header=None, dtype=str, on_bad_lines='skip')
+            body = frame.fillna('').to_string(index=False, header=False)
+        else:
+            return ''
+    except Exception as e:
+        logger.warning(f"Could not extract text from {path}: {str(e)}")
+        return ''
+    return body[:MAX_BODY_CHARS]
+
+
+def highlight(snippet):
+    """HTML-escape a snippet and turn the highlight markers into <mark> tags."""
+    escaped = html.escape(snippet or '')
+    return escaped.replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+
+class SearchIndex:
+    def __init__(self, engine):
+        self.engine = engine
+        self.postgres = engine.dialect.name == 'postgresql'
+
+    def create_schema(self):
+        with self.engine.begin() as conn:
+            if self.postgres:
+                conn.execute(text(
+                    "CREATE TABLE IF NOT EXISTS note_search ("
+                    " file_id INTEGER PRIMARY KEY,"
+                    " filename TEXT NOT NULL,"
+                    " body TEXT NOT NULL,"
+                    " content_hash VARCHAR(64),"
+                    " document tsvector GENERATED ALWAYS AS ("
+                    "  setweight(to_tsvector('english', coalesce(filename, '')), 'A') ||"
+                    "  setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED)"
+                ))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_note_search_document ON note_search USING GIN (document)"
+                ))
+            else:
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS note_search USING fts5("
+                    " filename, body, file_id UNINDEXED, content_hash UNINDEXED,"
+                    " tokenize = 'porter unicode61')"
+                ))
+
+    def indexed_hashes(self):
+        """Map file_id -> content hash the indexed text was built from."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT file_id, content_hash FROM note_search")).all()
+        return {int(file_id): content_hash for file_id, content_hash in rows}
+
+    def bodies(self, file_ids):
+        """Indexed text for the given file ids, looked up by primary key / rowid."""
+        found = {}
+        key = 'file_id' if self.postgres else 'rowid'
+        with self.engine.connect() as conn:
+            for file_id in file_ids:
+                row = conn.execute(text(f"SELECT body FROM note_search WHERE {key} = :id"), {'id': file_id}).first()
+                if row is not None:
+                    found[file_id] = row[0]
+        return found
+
+    def upsert(self, documents):
+        """Write (file_id, filename, body, content_hash) tuples in one transaction."""
+        if not documents:
+            return
+        params = [
+            {'file_id': file_id, 'filename': filename, 'body': body, 'hash': content_hash}
+            for file_id, filename, body, content_hash in documents
+        ]
+        with self.engine.begin() as conn:
+            if self.postgres:
+                conn.execute(text(
+                    "INSERT INTO note_search (file_id, filename, body, content_hash)"
+                    " VALUES (:file_id, :filename, :body, :hash)"
+                    " ON CONFLICT (file_id) DO UPDATE SET filename = EXCLUDED.filename,"
+                    " body = EXCLUDED.body, content_hash = EXCLUDED.content_hash"
+                ), params)
+            else:
+                # rowid mirrors file_id so lookups and deletes hit the rowid b-tree
+                conn.execute(text("DELETE FROM note_search WHERE rowid = :file_id"), params)
+                conn.execute(text(
+                    "INSERT INTO note_search (rowid, file_id, filename, body, content_hash)"
+                    " VALUES (:file_id, :file_id, :filename, :body, :hash)"
+                ), params)
+
+    def remove_missing(self, live_ids):
+        """Drop index rows whose File no longer exists."""
+        stale = set(self.indexed_hashes()) - set(live_ids)
+        if not stale:
+            return 0
+        key = 'file_id' if self.postgres else 'rowid'
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM note_search WHERE {key} = :file_id"),
+                         [{'file_id': file_id} for file_id in stale])
+        return len(stale)
+
+    def search(self, query, limit=20):
+        """Return ranked [{'file_id', 'filename', 'snippet', 'rank'}] for a free-text query."""
+        tokens = QUERY_TOKEN.findall(query or '')
+        if not tokens:
+            return []
+        with self.engine.connect() as conn:
+            if self.postgres:
+                rows = conn.execute(text(
+                    "SELECT file_id, filename,"
+                    " ts_headline('english', body, q, :options) AS snippet,"
+                    " ts_rank(document, q) AS rank"
+                    " FROM note_search, websearch_to_tsquery('english', :query) AS q"
+                    " WHERE document @@ q ORDER BY rank DESC LIMIT :limit"
+                ), {
+                    'query': ' '.join(tokens),
+                    'options': f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords=30, MinWords=10',
+                    'limit': limit,
+                }).all()
+            else:
+                # Quote every token so FTS5 operators in user input are taken literally;
+                # the last one is a prefix match for search-as-you-type.
+                match = ' '.join(f'"{token}"' for token in tokens[:-1])
+                match = f'{match} "{tokens[-1]}"*'.strip()
+                rows = conn.execute(text(
+                    "SELECT file_id, filename,"
+                    " snippet(note_search, 1, :start, :end, '…', 16) AS snippet,"
+                    " bm25(note_search, 4.0, 1.0) AS rank"
+                    " FROM note_search WHERE note_search MATCH :match ORDER BY rank LIMIT :limit"
+                ), {'match': match, 'start': HIGHLIGHT_START, 'end': HIGHLIGHT_END, 'limit': limit}).all()
+        return [
+            {
+                'file_id': int(file_id),
+                'filename': filename,
+                'snippet': highlight(snippet),
+                'rank': round(abs(float(rank)), 6),
+            }
+            for file_id, filename, snippet, rank in rows
+        ]
@@ -100,47 +100,56 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Delete Unit with Secret Key
-    const deleteButtons = document.querySelectorAll('.delete-unit-btn');
+    function bindDeleteButton(button) {
+        button.addEventListener('click', (e) => {
+            e.preventDefault(); // Prevent default confirmation dialog
+            const unitId = button.dataset.unitId;
+            const unitName = button.closest('.unit-header').querySelector('h3').textContent;
+
+            // Prompt for confirmation
+            if (!confirm(`Are you sure you want to delete ${unitName}?`)) {
+                return;
+            }
 
-    if (deleteButtons.length) {
-        deleteButtons.forEach(button => {
-            button.addEventListener('click', (e) => {
-                e.preventDefault(); // Prevent default confirmation dialog
-                const unitId = button.dataset.unitId;
-                const unitName = button.closest('.unit-header').querySelector('h3').textContent;
-
-                // Prompt for confirmation
-                if (!confirm(`Are you sure you want to delete ${unitName}?`)) {
-                    return;
-                }
+            // Prompt for secret key
+            const secretKey = prompt('Enter the secret key to delete this unit:');
+            if (!secretKey) {
+                alert('Secret key is required.');
+                console.log('Unit deletion cancelled: No secret key provided');
+                return;
+            }
 
-                // Prompt for secret key
-                const secretKey = prompt('Enter the secret key to delete this unit:');
-                if (!secretKey) {
-                    alert('Secret key is required.');
-                    console.log('Unit deletion cancelled: No secret key provided');
+            // Send deletion request; the unit_deleted event removes the card,
+            // so the redirect back to / is not followed.
+            fetch('/', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/x-www-form-urlencoded'
+                },
+                body: `delete_unit_id=${encodeURIComponent(unitId)}&secret_key=${encodeURIComponent(secretKey)}`,
+                redirect: 'manual'
+            })
+            .then(response => {
+                if (response.status === 429) {
+                    alert('Too many delete attempts. Please wait a minute and try again.');
                     return;
                 }
-
-                // Send deletion request
-                fetch('/', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/x-www-form-urlencoded'
-                    },
-                    body: `delete_unit_id=${encodeURIComponent(unitId)}&secret_key=${encodeURIComponent(secretKey)}`
-                })
-                .then(response => response.text())
-                .then(() => {
-                    // Reload page to reflect changes
+                if (!hubSocket || !hubSocket.connected) {
+                    // No live updates, reload page to reflect changes
                     window.location.reload();
-                })
-                .catch(err => {
-                    console.error('Error deleting unit:', err);
-                    alert('Failed to delete unit. Please try again.');
-                });
+                }
+            })
+            .catch(err => {
+                console.error('Error deleting unit:', err);
+                alert('Failed to delete unit. Please try again.');
             });
         });
+    }
+
+    const deleteButtons = document.querySelectorAll('.delete-unit-btn');
+
+    if (deleteButtons.length) {
+        deleteButtons.forEach(bindDeleteButton);
         console.log('Delete unit buttons initialized');
     } else {
         console.error('No delete unit buttons found');
@@ -150,9 +159,19 @@ document.addEventListener('DOMContentLoaded', () => {
     const searchInput = document.querySelector('#notes-search');
     const searchBtn = document.querySelector('.search-btn');
 
+    const searchResults = document.querySelector('.search-results');
+
     if (searchInput && searchBtn) {
         searchInput.addEventListener('input', filterNotes);
-        searchBtn.addEventListener('click', filterNotes);
+        searchBtn.addEventListener('click', () => {
+            filterNotes();
+            searchNoteContents();
+        });
+        searchInput.addEventListener('keydown', (e) => {
+            if (e.key === 'Enter') {
+                searchNoteContents();
+            }
+        });
         console.log('Notes search initialized');
     } else {
         console.error('Search input or button not found');
@@ -172,6 +191,47 @@ document.addEventListener('DOMContentLoaded', () => {
         console.log('Notes filtered with query:', query);
     }
 
+    // Full-text search inside uploaded notes
+    function searchNoteContents() {
+        const query = searchInput.value.trim();
+        if (!searchResults) {
+            return;
+        }
+        if (!query) {
+            searchResults.hidden = true;
+            searchResults.replaceChildren();
+            return;
+        }
+        fetch(`/search?q=${encodeURIComponent(query)}`)
+            .then(response => response.json())
+            .then(data => {
+                searchResults.replaceChildren();
+                if (!data.results || !data.results.length) {
+                    const empty = document.createElement('p');
+                    empty.className = 'no-timetable';
+                    empty.textContent = 'No notes mention that.';
+                    searchResults.appendChild(empty);
+                }
+                (data.results || []).forEach(result => {
+                    const item = document.createElement('div');
+                    item.className = 'material-item';
+                    const link = document.createElement('a');
+                    link.href = result.url;
+                    link.className = 'grab-link';
+                    link.setAttribute('download', result.filename);
+                    link.textContent = result.unit ? `${result.filename} (${result.unit})` : result.filename;
+                    const snippet = document.createElement('p');
+                    snippet.className = 'lecturer-info';
+                    snippet.innerHTML = result.snippet; // escaped server-side, only <mark> tags
+                    item.append(link, snippet);
+                    searchResults.appendChild(item);
+                });
+                searchResults.hidden = false;
+                console.log(`Search for "${query}" returned ${data.results.length} notes in ${data.took_ms}ms`);
+            })
+            .catch(err => console.error('Error searching notes:', err));
+    }
+
     // Simplify Form Validation
     const simplifyForm = document.querySelector('#simplifyForm');
     if (simplifyForm) {
@@ -199,7 +259,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Countdown Timer
-    document.querySelectorAll('.countdown').forEach(span => {
+    function startCountdown(span) {
         const dueDate = span.dataset.due;
         if (dueDate) {
             const due = new Date(dueDate.split('/').reverse().join('-'));
@@ -220,7 +280,9 @@ document.addEventListener('DOMContentLoaded', () => {
             setInterval(updateCountdown, 60000);
             console.log('Countdown initialized for due date:', dueDate);
         }
-    });
+    }
+
+    document.querySelectorAll('.countdown').forEach(startCountdown);
 
     // Chaos Meter
     const chaosScore = document.querySelector('.chaos-score');
@@ -239,6 +301,281 @@ document.addEventListener('DOMContentLoaded', () => {
             console.log('Chaos meter updated:', { count, tag, percent });
         }
         updateChaosMeter();
+        document.addEventListener('assignments:changed', updateChaosMeter);
+    }
+
+    // Live Dashboard Updates
+    const vaultUnits = document.querySelector('.units-container');
+    const assignmentList = document.querySelector('.assignment-list');
+    const telegramJob = new URLSearchParams(window.location.search).get('telegram_job');
+    const hubSocket = (typeof io !== 'undefined' && (vaultUnits || telegramJob))
+        ? io({ transports: ['websocket'] })
+        : null;
+
+    function createElement(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text !== undefined && text !== null) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function parseDue(dueDate) {
+        return new Date(dueDate.split('/').reverse().join('-'));
+    }
+
+    function renderNote(note) {
+        const item = createElement('div', 'material-item');
+        item.appendChild(createElement('span', 'material-name', note.filename));
+        const link = createElement('a', 'grab-link', 'Grab');
+        link.href = note.url;
+        link.setAttribute('download', note.filename);
+        item.appendChild(link);
+        return item;
+    }
+
+    function renderUnit(unit) {
+        const card = createElement('div', 'unit');
+        card.dataset.unit = unit.id;
+
+        const header = createElement('div', 'unit-header');
+        header.appendChild(createElement('h3', null, unit.name));
+        const deleteButton = createElement('button', 'delete-unit-btn', 'Delete');
+        deleteButton.dataset.unitId = unit.id;
+        bindDeleteButton(deleteButton);
+        header.appendChild(deleteButton);
+        card.appendChild(header);
+
+        if (unit.lecturer) {
+            card.appendChild(createElement('p', 'lecturer-info', `Lecturer: ${unit.lecturer}`));
+            [['Phone', unit.phone, 'tel:'], ['Email', unit.email, 'mailto:']].forEach(([label, value, scheme]) => {
+                if (value) {
+                    const info = createElement('p', 'lecturer-info', `${label}: `);
+                    const link = createElement('a', null, value);
+                    link.href = `${scheme}${value}`;
+                    info.appendChild(link);
+                    card.appendChild(info);
+                }
+            });
+        }
+
+        const materials = createElement('div', 'unit-materials');
+        materials.appendChild(createElement('p', 'no-timetable', 'No notes available for this unit.'));
+        const form = createElement('form', 'upload-form');
+        form.method = 'POST';
+        form.enctype = 'multipart/form-data';
+        const fileInput = createElement('input');
+        fileInput.type = 'file';
+        fileInput.name = 'note';
+        fileInput.accept = '.xlsx,.csv,.docx,.pdf,.xls';
+        fileInput.required = true;
+        const unitInput = createElement('input');
+        unitInput.type = 'hidden';
+        unitInput.name = 'unit_id';
+        unitInput.value = unit.id;
+        const submit = createElement('button', 'upload-btn', 'Upload File');
+        submit.type = 'submit';
+        form.append(fileInput, unitInput, submit);
+        materials.appendChild(form);
+        card.appendChild(materials);
+        return card;
+    }
+
+    function renderAssignment(assignment) {
+        const item = createElement('div', 'assignment-item');
+        item.dataset.id = assignment.id;
+        item.dataset.due = assignment.due_date;
+        item.appendChild(createElement('h3', null, assignment.topic));
+        item.appendChild(createElement('p', 'assignment', assignment.remark));
+        item.appendChild(createElement('span', 'posted-date',
+            `Due: ${assignment.due_date} | Posted: ${assignment.posted_date || ''}`));
+        const countdown = createElement('span', 'countdown');
+        countdown.dataset.due = assignment.due_date;
+        item.appendChild(countdown);
+        startCountdown(countdown);
+        return item;
+    }
+
+    if (hubSocket && vaultUnits) {
+        hubSocket.on('note_added', (note) => {
+            const card = vaultUnits.querySelector(`.unit[data-unit="${note.unit_id}"]`);
+            if (!card) {
+                return;
+            }
+            const materials = card.querySelector('.unit-materials');
+            const empty = materials.querySelector('.no-timetable');
+            if (empty) {
+                empty.remove();
+            }
+            materials.querySelector('.upload-form').before(renderNote(note));
+            console.log('Note added:', note.filename);
+        });
+
+        hubSocket.on('unit_added', (unit) => {
+            if (!vaultUnits.querySelector(`.unit[data-unit="${unit.id}"]`)) {
+                vaultUnits.appendChild(renderUnit(unit));
+                console.log('Unit added:', unit.name);
+            }
+        });
+
+        hubSocket.on('unit_deleted', (data) => {
+            const card = vaultUnits.querySelector(`.unit[data-unit="${data.unit_id}"]`);
+            if (card) {
+                card.remove();
+                console.log('Unit deleted:', data.unit_id);
+            }
+        });
+
+        hubSocket.on('timetable_replaced', (timetable) => {
+            const entry = document.querySelector(`.timetable-entry[data-timetable="${timetable.type}"]`);
+            if (!entry) {
+                return;
+            }
+            const link = createElement('a', 'doc-link', timetable.filename);
+            link.href = timetable.url;
+            entry.replaceChildren(
+                createElement('p', 'header', timetable.type === 'class_timetable' ? 'Class Timetable:' : 'Exam Schedule:'),
+                link,
+                createElement('p', 'upload-date', `Uploaded: ${timetable.upload_date || ''}`)
+            );
+            console.log('Timetable replaced:', timetable.type);
+        });
+
+        if (assignmentList) {
+            hubSocket.on('assignment_posted', (assignment) => {
+                if (assignmentList.querySelector(`.assignment-item[data-id="${assignment.id}"]`)) {
+                    return;
+                }
+                const due = parseDue(assignment.due_date);
+                const next = Array.from(assignmentList.querySelectorAll('.assignment-item'))
+                    .find(item => parseDue(item.dataset.due) > due);
+                assignmentList.insertBefore(renderAssignment(assignment), next || null);
+                document.dispatchEvent(new Event('assignments:changed'));
+                console.log('Assignment posted:', assignment.topic);
+            });
+
+            hubSocket.on('assignment_expired', (data) => {
+                const cutoff = parseDue(data.due_before);
+                assignmentList.querySelectorAll('.assignment-item').forEach(item => {
+                    if (parseDue(item.dataset.due) < cutoff) {
+                        item.remove();
+                    }
+                });
+                document.dispatchEvent(new Event('assignments:changed'));
+                console.log('Expired assignments removed before:', data.due_before);
+            });
+        }
+
+        // A bulk import has too many rows to patch in one by one. Every open
+        // dashboard reloading at once would hit the server together, so show a
+        // banner and fetch the new units and assignments after a random delay
+        // (or straight away when the banner's button is clicked).
+        const BULK_REFRESH_JITTER_MS = 30000;
+        let bulkBanner = null;
+        let bulkRefreshTimer = null;
+
+        async function refreshDashboardSections() {
+            clearTimeout(bulkRefreshTimer);
+            bulkRefreshTimer = null;
+            try {
+                const response = await fetch('/', { credentials: 'same-origin' });
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                const page = new DOMParser().parseFromString(await response.text(), 'text/html');
+                const units = page.querySelector('.units-container');
+                if (units) {
+                    vaultUnits.replaceChildren(...units.children);
+                    vaultUnits.querySelectorAll('.delete-unit-btn').forEach(bindDeleteButton);
+                    if (searchInput && searchInput.value) {
+                        filterNotes();
+                    }
+                }
+                const assignments = page.querySelector('.assignment-list');
+                if (assignmentList && assignments) {
+                    assignmentList.replaceChildren(...assignments.children);
+                    assignmentList.querySelectorAll('.countdown').forEach(startCountdown);
+                    document.dispatchEvent(new Event('assignments:changed'));
+                }
+                // An import announced mid-fetch keeps its banner and pending fetch.
+                if (bulkBanner && !bulkRefreshTimer) {
+                    bulkBanner.remove();
+                    bulkBanner = null;
+                }
+                console.log('Dashboard refreshed after bulk import');
+            } catch (error) {
+                if (bulkBanner) {
+                    bulkBanner.querySelector('span').textContent = 'New data was imported. Reload the page to see it.';
+                    bulkBanner.querySelector('button').onclick = () => window.location.reload();
+                }
+                console.error('Dashboard refresh failed:', error);
+            }
+        }
+
+        hubSocket.on('bulk_imported', (data) => {
+            console.log(`Bulk import of ${data.kind}: ${data.inserted} added, ${data.updated} updated`);
+            if (!bulkBanner) {
+                bulkBanner = createElement('div', 'refresh-banner');
+                const refreshButton = createElement('button', 'refresh-btn', 'Refresh');
+                refreshButton.onclick = refreshDashboardSections;
+                bulkBanner.append(createElement('span'), refreshButton);
+                vaultUnits.before(bulkBanner);
+            }
+            bulkBanner.querySelector('span').textContent =
+                `New ${data.kind} were imported (${data.inserted} added, ${data.updated} updated).`;
+            // Several imports in a row share one pending fetch.
+            if (!bulkRefreshTimer) {
+                bulkRefreshTimer = setTimeout(refreshDashboardSections, Math.random() * BULK_REFRESH_JITTER_MS);
+            }
+        });
+
+        hubSocket.on('news_updated', (data) => {
+            const feed = document.querySelector('#trends .news-feed');
+            if (!feed || !data.articles.length) {
+                return;
+            }
+            const list = createElement('ul', 'news-list');
+            data.articles.forEach(article => {
+                const item = createElement('li');
+                const link = createElement('a', null, article.title);
+                link.href = article.url;
+                link.target = '_blank';
+                item.append(link, createElement('p', null, article.description),
+                    createElement('span', null, `Source: ${article.source} | Fetched: ${article.fetched_at}`));
+                list.appendChild(item);
+            });
+            feed.replaceChildren(list);
+            console.log('News updated:', data.articles.length);
+        });
+        console.log('Live dashboard updates initialized');
+    }
+
+    // Telegram Delivery Status
+    const quickLinks = document.querySelector('.quick-links');
+    if (hubSocket && telegramJob && quickLinks) {
+        const statusLine = document.createElement('p');
+        statusLine.className = 'telegram-status';
+        statusLine.textContent = 'Sending message to Telegram...';
+        quickLinks.querySelector('h2').after(statusLine);
+
+        hubSocket.on('connect', () => {
+            hubSocket.emit('telegram_status', { job_id: telegramJob });
+        });
+        hubSocket.on('telegram_status', (data) => {
+            if (data.job_id !== telegramJob) {
+                return;
+            }
+            if (data.status === 'sent') {
+                statusLine.textContent = 'Message sent to Telegram successfully';
+            } else {
+                statusLine.textContent = `Error sending message: ${data.error}`;
+                statusLine.style.color = 'var(--error-color)';
+            }
+            console.log('Telegram delivery status:', data);
+        });
     }
 
     // Socket.IO Chat (Only for ai_chat.html)
@@ -0,0 +1,53 @@
+"""Shared fixtures: the app imported against a throwaway database.
+
+app.py reads its configuration from the environment at import time, so the
+environment is set up here before anything imports it. Nothing starts on
+import (see start_app()), so the scheduler and news warm-up stay off.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix='nexushub-tests-')
+
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(WORKDIR, 'test.db')}",
+    UPLOAD_FOLDER=os.path.join(WORKDIR, 'Uploads'),
+    OUTPUT_FOLDER=os.path.join(WORKDIR, 'outputs'),
+    SECRET_KEY='test-secret',
+    SEARCH_WORKERS='0',
+    NEWS_API_BASE='http://127.0.0.1:9',
+    TELEGRAM_API_BASE='http://127.0.0.1:9',
+    OUTBOUND_RETRIES='0',
+    UNIT_DELETE_SECRET_KEY='test-delete-key',
+    BULK_IMPORT_SECRET_KEY='test-bulk-key',
+)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import app as nexushub  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def bootstrapped():
+    nexushub.bootstrap_database()
+    os.makedirs(nexushub.app.config['UPLOAD_FOLDER'], exist_ok=True)
+    return nexushub
+
+
+@pytest.fixture
+def hub(bootstrapped):
+    """The app module with empty tables (the admin account is kept) and fresh rate limit counters."""
+    with nexushub.app.app_context():
+        db = nexushub.db
+        for table in reversed(db.metadata.sorted_tables):
+            if table.name != nexushub.Admin.__tablename__:
+                db.session.execute(table.delete())
+        db.session.commit()
+        nexushub.dashboard_cache.invalidate()
+    nexushub.limiter.reset()
+    with nexushub.app.app_context():
+        yield nexushub
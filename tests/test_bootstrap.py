@@ -0,0 +1,48 @@
+"""bootstrap_database() runs in one worker at a time and fails loudly."""
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.exc import ProgrammingError
+
+
+def lock_row(hub):
+    hub.db.session.expire_all()
+    return hub.db.session.get(hub.JobLock, 'bootstrap_database')
+
+
+def test_waits_for_another_worker_to_finish(hub):
+    hub.db.session.add(hub.JobLock(name='bootstrap_database', owner='other-host:1:abcd',
+                                   expires_at=hub.utcnow() + timedelta(seconds=1)))
+    hub.db.session.commit()
+
+    started = time.monotonic()
+    hub.bootstrap_database()
+
+    assert time.monotonic() - started >= 0.5
+    lock = lock_row(hub)
+    assert lock.owner == hub.PROCESS_ID
+    assert lock.expires_at <= hub.utcnow()
+
+
+def test_failed_migration_is_raised_and_releases_the_lock(hub, monkeypatch):
+    def duplicate_column(engine, metadata):
+        raise ProgrammingError('ALTER TABLE news_cache ADD COLUMN attempted_at', {}, Exception('DuplicateColumn'))
+    monkeypatch.setattr(hub, 'run_migrations', duplicate_column)
+
+    with pytest.raises(ProgrammingError):
+        hub.bootstrap_database()
+
+    assert lock_row(hub).expires_at <= hub.utcnow()
+
+
+def test_failed_bootstrap_keeps_the_process_from_starting(hub, monkeypatch):
+    def fail():
+        raise RuntimeError('Timed out waiting for the bootstrap_database lock')
+    monkeypatch.setattr(hub, 'bootstrap_database', fail)
+    monkeypatch.setattr(hub, 'app_started', False)
+
+    with pytest.raises(RuntimeError):
+        hub.start_app()
+
+    assert hub.app_started is False
@@ -0,0 +1,73 @@
+"""POST /bulk/<kind> reports bad rows instead of failing, and upserts only what it was given."""
+import io
+
+import pytest
+
+HEADERS = {'X-Secret-Key': 'test-bulk-key'}
+
+
+@pytest.fixture
+def client(hub):
+    return hub.app.test_client()
+
+
+def import_json(client, kind, rows):
+    return client.post(f'/bulk/{kind}', json=rows, headers=HEADERS)
+
+
+@pytest.mark.parametrize('rows, error', [
+    ([{'topic': 'T', 'remark': 'r'}], 'is required'),
+    ([{'topic': 'T', 'remark': 'r', 'due_date': 'next friday'}], 'is not a date (use YYYY-MM-DD or DD/MM/YYYY)'),
+])
+def test_assignments_without_a_usable_due_date_are_row_errors(client, rows, error):
+    response = import_json(client, 'assignments', rows)
+
+    assert response.status_code == 422
+    assert response.json['errors'] == [{'row': 1, 'field': 'due_date', 'error': error}]
+
+
+def test_impossible_csv_date_is_a_row_error(client):
+    upload = io.BytesIO(b'topic,remark,due_date\nT,r,31/02/2030\n')
+    response = client.post('/bulk/assignments', data={'file': (upload, 'assignments.csv')}, headers=HEADERS)
+
+    assert response.status_code == 422
+    assert response.json['errors'] == [
+        {'row': 1, 'field': 'due_date', 'error': 'is not a date (use YYYY-MM-DD or DD/MM/YYYY)'}
+    ]
+
+
+def test_past_and_future_due_dates_in_one_batch(client):
+    response = import_json(client, 'assignments', [
+        {'topic': 'Old', 'remark': 'r', 'due_date': '2001-01-01'},
+        {'topic': 'New', 'remark': 'r', 'due_date': '2099-01-01'},
+    ])
+
+    assert response.status_code == 200
+    assert response.json['inserted'] == 1
+    assert response.json['errors'] == [{'row': 1, 'field': 'due_date', 'error': 'is in the past'}]
+
+
+def test_json_upsert_keeps_fields_an_object_leaves_out(client, hub):
+    import_json(client, 'units', [{'name': 'Math', 'lecturer': 'Dr A', 'phone': '0712345678', 'email': 'a@uni.ac'}])
+
+    response = import_json(client, 'units', [
+        {'name': 'Math', 'lecturer': 'Dr Z'},
+        {'name': 'Phys', 'phone': '0799999999'},
+    ])
+
+    assert response.status_code == 200
+    assert (response.json['inserted'], response.json['updated']) == (1, 1)
+    hub.db.session.expire_all()
+    math = hub.Unit.query.filter_by(name='Math').one()
+    assert (math.lecturer, math.phone, math.email) == ('Dr Z', '0712345678', 'a@uni.ac')
+    assert hub.Unit.query.filter_by(name='Phys').one().phone == '0799999999'
+
+
+def test_json_null_clears_a_field(client, hub):
+    import_json(client, 'units', [{'name': 'Math', 'lecturer': 'Dr A', 'phone': '0712345678'}])
+
+    import_json(client, 'units', [{'name': 'Math', 'phone': None}])
+
+    hub.db.session.expire_all()
+    math = hub.Unit.query.filter_by(name='Math').one()
+    assert (math.lecturer, math.phone) == ('Dr A', None)
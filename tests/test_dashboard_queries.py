@@ -0,0 +1,57 @@
+"""load_dashboard() runs the same number of SQL statements however much data there is."""
+import contextlib
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+
+@contextlib.contextmanager
+def count_queries(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def seed(hub, units, notes_per_unit):
+    db = hub.db
+    db.session.execute(db.insert(hub.Unit), [{'name': f'Unit {i}'} for i in range(units)])
+    unit_ids = db.session.scalars(db.select(hub.Unit.id)).all()
+    db.session.execute(db.insert(hub.File), [
+        {'filename': f'note_{unit_id}_{n}.pdf', 'type': 'note', 'unit_id': unit_id}
+        for unit_id in unit_ids for n in range(notes_per_unit)
+    ])
+    db.session.add_all([
+        hub.File(filename='class.csv', type='class_timetable'),
+        hub.File(filename='exam.csv', type='exam_timetable'),
+        hub.Assignment(topic='Essay', remark='Due soon', due_date=date.today() + timedelta(days=3)),
+    ])
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def dashboard_queries(hub):
+    with count_queries(hub.db.engine) as statements:
+        dashboard = hub.load_dashboard()
+        for unit in dashboard['units']:
+            list(unit.notes)
+    return len(statements), dashboard
+
+
+def test_query_count_is_constant_as_units_and_notes_grow(hub):
+    seed(hub, units=1, notes_per_unit=1)
+    small_count, small = dashboard_queries(hub)
+    assert len(small['units']) == 1
+
+    seed(hub, units=200, notes_per_unit=5)
+    large_count, large = dashboard_queries(hub)
+    assert len(large['units']) == 201
+    assert sum(len(unit.notes) for unit in large['units']) == hub.File.query.filter_by(type='note').count() > 1000
+
+    assert large_count == small_count
@@ -0,0 +1,52 @@
+"""Legacy string dates are converted in place, and rows that cannot be kept are quarantined, not lost."""
+import json
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from migrations import run_migrations
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE assignment (id INTEGER PRIMARY KEY, topic VARCHAR(100) NOT NULL, '
+                          'remark VARCHAR(200) NOT NULL, due_date VARCHAR(20) NOT NULL, posted_date VARCHAR(20))'))
+        conn.execute(text("INSERT INTO assignment VALUES (1, 'Essay', 'Chapter 1', '25/12/2030', '01/12/2030'), "
+                          "(2, 'Lab', 'Report', 'sometime soon', '01/12/2030')"))
+    yield engine
+    engine.dispose()
+
+
+def migrate(hub, engine):
+    # Same order as bootstrap_database: missing tables first, then upgrades.
+    hub.db.metadata.create_all(engine)
+    run_migrations(engine, hub.db.metadata)
+
+
+def test_unparseable_rows_are_moved_to_quarantine(hub, legacy_engine):
+    migrate(hub, legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        kept = conn.execute(text('SELECT id, due_date FROM assignment')).all()
+        quarantined = conn.execute(text('SELECT table_name, row_id, column_name, original_value, row_data '
+                                        'FROM migration_quarantine')).mappings().all()
+    assert kept == [(1, '2030-12-25')]
+    due_date = next(c for c in inspect(legacy_engine).get_columns('assignment') if c['name'] == 'due_date')
+    assert not due_date['nullable']
+    assert len(quarantined) == 1
+    entry = quarantined[0]
+    assert (entry['table_name'], entry['row_id'], entry['column_name'], entry['original_value']) == \
+        ('assignment', 2, 'due_date', 'sometime soon')
+    assert json.loads(entry['row_data']) == {'id': 2, 'topic': 'Lab', 'remark': 'Report',
+                                             'due_date': None, 'posted_date': '2030-12-01'}
+
+
+def test_second_run_changes_nothing(hub, legacy_engine):
+    migrate(hub, legacy_engine)
+    migrate(hub, legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        assert conn.execute(text('SELECT count(*) FROM assignment')).scalar() == 1
+        assert conn.execute(text('SELECT count(*) FROM migration_quarantine')).scalar() == 1
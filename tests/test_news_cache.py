@@ -0,0 +1,103 @@
+"""NewsAPI failures keep the last good headlines, against a local NewsAPI stub."""
+from datetime import timedelta
+
+import pytest
+
+from stubs import StubServer, news_body
+
+OLD_ARTICLES = [{'title': 'Yesterday', 'description': 'Still worth showing', 'url': 'https://example.com/old',
+                 'source': 'Old News', 'fetched_at': '2026-01-01 00:00:00'}]
+
+
+@pytest.fixture
+def news(hub, monkeypatch):
+    stub = StubServer(news_body()).start()
+    monkeypatch.setitem(hub.app.config, 'NEWS_API_BASE', stub.url)
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def cached(hub):
+    """A stale cache entry holding OLD_ARTICLES."""
+    fetched_at = hub.utcnow() - timedelta(seconds=hub.app.config['NEWS_MAX_AGE'] + 60)
+    hub.db.session.add(hub.NewsCache(key=hub.NEWS_CACHE_KEY, articles=OLD_ARTICLES, fetched_at=fetched_at))
+    hub.db.session.commit()
+    return fetched_at
+
+
+def stored(hub):
+    hub.db.session.expire_all()
+    return hub.db.session.get(hub.NewsCache, hub.NEWS_CACHE_KEY)
+
+
+def test_success_replaces_the_articles(hub, news, cached):
+    hub.fetch_tech_news()
+
+    entry = stored(hub)
+    assert [article['title'] for article in entry.articles] == [f'Benchmark headline {i}' for i in range(5)]
+    assert entry.fetched_at > cached
+    assert entry.last_error is None
+
+
+def test_server_error_keeps_the_previous_articles(hub, news, cached):
+    news.respond({'status': 'error', 'message': 'upstream down'}, status=500)
+
+    hub.fetch_tech_news()
+
+    entry = stored(hub)
+    assert entry.articles == OLD_ARTICLES
+    assert entry.fetched_at == cached
+    assert entry.last_error == 'HTTP 500'
+    assert entry.attempted_at > cached
+
+
+def test_timeout_keeps_the_previous_articles(hub, news, cached, monkeypatch):
+    monkeypatch.setattr(hub.http_client, 'timeout', 0.2)
+    news.delay = 1.0
+
+    hub.fetch_tech_news()
+
+    entry = stored(hub)
+    assert entry.articles == OLD_ARTICLES
+    assert entry.fetched_at == cached
+    assert entry.last_error
+
+
+def test_empty_response_does_not_blank_the_cache(hub, news, cached):
+    news.respond({'status': 'ok', 'articles': []})
+
+    hub.fetch_tech_news()
+
+    entry = stored(hub)
+    assert entry.articles == OLD_ARTICLES
+    assert entry.last_error == 'No articles returned'
+
+
+def test_lock_held_by_another_process_skips_the_fetch(hub, news, cached):
+    hub.db.session.add(hub.JobLock(name='fetch_tech_news', owner='other-host:1:abcd',
+                                   expires_at=hub.utcnow() + timedelta(seconds=60)))
+    hub.db.session.commit()
+
+    hub.fetch_tech_news()
+
+    assert news.calls == 0
+    entry = stored(hub)
+    assert entry.articles == OLD_ARTICLES
+    assert entry.attempted_at is None
+
+
+def test_failed_attempt_holds_off_the_next_refresh(hub, cached, monkeypatch):
+    refreshes = []
+    monkeypatch.setattr(hub, 'refresh_tech_news_async', lambda: refreshes.append(1))
+    entry = stored(hub)
+    entry.attempted_at = hub.utcnow()
+    hub.db.session.commit()
+
+    assert hub.get_tech_news() == OLD_ARTICLES
+    assert refreshes == []
+
+    entry.attempted_at = hub.utcnow() - timedelta(seconds=hub.app.config['NEWS_RETRY_INTERVAL'] + 1)
+    hub.db.session.commit()
+    assert hub.get_tech_news() == OLD_ARTICLES
+    assert refreshes == [1]
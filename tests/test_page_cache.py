@@ -0,0 +1,70 @@
+"""Page caches in different processes share one invalidation generation."""
+from page_cache import PageCache
+from test_dashboard_queries import count_queries
+
+
+def worker_cache(hub, sync_interval=0):
+    """One worker process's dashboard cache: its own entries, the shared DB row."""
+    return PageCache(ttl=300, shared=hub.DatabaseGeneration('dashboard'), sync_interval=sync_interval)
+
+
+def render(cache, body):
+    """What index() does on a miss: look up, note the generation, store."""
+    assert cache.get('index') is None
+    cache.set('index', body, cache.generation())
+
+
+def test_invalidation_in_another_worker_drops_the_page(hub):
+    here, there = worker_cache(hub), worker_cache(hub)
+    render(here, '<p>old</p>')
+    render(there, '<p>old</p>')
+    assert there.get('index').body == '<p>old</p>'
+
+    here.invalidate()
+
+    assert there.get('index') is None
+    assert there.generation() == here.generation()
+    assert there.stats()['last_modified'] == here.stats()['last_modified']
+
+
+def test_page_rendered_before_a_remote_invalidation_is_dropped_on_next_lookup(hub):
+    here, there = worker_cache(hub), worker_cache(hub)
+    assert there.get('index') is None
+    generation = there.generation()
+
+    here.invalidate()  # lands while `there` is still rendering
+    there.set('index', '<p>stale</p>', generation)
+
+    assert there.get('index') is None
+
+
+def test_unreadable_generation_is_a_miss(hub, monkeypatch):
+    cache = worker_cache(hub)
+    render(cache, '<p>page</p>')
+    monkeypatch.setattr(cache.shared, 'read', lambda: None)
+
+    assert cache.get('index') is None
+
+
+def test_single_worker_hit_runs_no_queries(hub):
+    assert hub.dashboard_cache.shared is None  # WEB_CONCURRENCY is unset in tests
+    render(hub.dashboard_cache, '<p>page</p>')
+
+    with count_queries(hub.db.engine) as statements:
+        assert hub.dashboard_cache.get('index').body == '<p>page</p>'
+    assert statements == []
+
+
+def test_shared_generation_is_read_at_most_once_per_interval(hub):
+    here, there = worker_cache(hub), worker_cache(hub, sync_interval=60)
+    render(there, '<p>page</p>')
+
+    with count_queries(hub.db.engine) as statements:
+        for _ in range(5):
+            assert there.get('index') is not None
+    assert statements == []
+
+    here.invalidate()
+    assert there.get('index') is not None  # seen once the interval is up
+    there._next_sync = 0
+    assert there.get('index') is None
@@ -0,0 +1,75 @@
+"""Rate limits and load shedding on the write and outbound endpoints."""
+import io
+
+import pytest
+
+from backpressure import ConcurrencyLimit
+from outbound import SendQueue
+
+
+@pytest.fixture
+def client(hub, monkeypatch):
+    """A test client with small limits."""
+    monkeypatch.setitem(hub.app.config, 'SECRET_KEY_RATE_LIMIT', '2 per minute')
+    monkeypatch.setitem(hub.app.config, 'UPLOAD_RATE_LIMIT', '2 per minute')
+    monkeypatch.setitem(hub.app.config, 'WTF_CSRF_ENABLED', False)
+    return hub.app.test_client()
+
+
+def delete_unit(client, key='wrong'):
+    return client.post('/', data={'delete_unit_id': '1', 'secret_key': key})
+
+
+def test_over_the_limit_gets_429_with_retry_after(client):
+    assert delete_unit(client).status_code != 429
+    assert delete_unit(client).status_code != 429
+
+    response = delete_unit(client)
+
+    assert response.status_code == 429
+    assert 1 <= int(response.headers['Retry-After']) <= 60
+    assert 'Too many requests' in response.json['error']
+
+
+def test_limits_are_counted_per_client_ip(client):
+    for _ in range(2):
+        delete_unit(client)
+    assert delete_unit(client).status_code == 429
+
+    other = client.post('/', data={'delete_unit_id': '1', 'secret_key': 'wrong'},
+                        environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert other.status_code != 429
+
+
+def test_secret_key_guesses_share_one_budget_across_endpoints(client):
+    delete_unit(client)
+    assert client.post('/bulk/units', json=[], headers={'X-Secret-Key': 'wrong'}).status_code == 403
+
+    assert client.post('/bulk/units', json=[], headers={'X-Secret-Key': 'wrong'}).status_code == 429
+    assert delete_unit(client).status_code == 429
+
+
+def test_upload_is_shed_when_every_slot_is_taken(client, hub, monkeypatch):
+    slots = ConcurrencyLimit(1, queue_size=0)
+    monkeypatch.setattr(hub, 'upload_slots', slots)
+    assert slots.acquire()
+    try:
+        response = client.post('/', data={'note': (io.BytesIO(b'a,b\n'), 'notes.csv'), 'unit_id': '1'})
+    finally:
+        slots.release()
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(hub.app.config['RETRY_AFTER_SECONDS'])
+    assert slots.stats() == {'active': 0, 'waiting': 0}
+
+
+def test_telegram_send_is_refused_when_the_queue_is_full(client, hub, monkeypatch):
+    # Workers never start, so the one queued job stays put.
+    monkeypatch.setattr(hub, 'send_queue', SendQueue(maxsize=1, start_task=lambda target: None))
+    assert client.post('/send_telegram', data={'message': 'first'}).status_code == 302
+
+    response = client.post('/send_telegram', data={'message': 'second'})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(hub.app.config['RETRY_AFTER_SECONDS'])
+    assert b'Telegram queue is full' in response.data
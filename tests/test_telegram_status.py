@@ -0,0 +1,33 @@
+"""Telegram delivery status reaches only the client that asked for that job."""
+
+
+def test_status_goes_only_to_the_submitting_client(hub):
+    submitter = hub.socketio.test_client(hub.app)
+    bystander = hub.socketio.test_client(hub.app)
+    try:
+        submitter.emit('telegram_status', {'job_id': 'job-a'})
+        bystander.emit('telegram_status', {'job_id': 'job-b'})
+        submitter.get_received()
+        bystander.get_received()
+
+        hub.report_telegram_status('job-a', None, None)
+
+        received = [message['args'][0] for message in submitter.get_received()
+                    if message['name'] == 'telegram_status']
+        assert received == [{'job_id': 'job-a', 'status': 'sent'}]
+        assert not [message for message in bystander.get_received() if message['name'] == 'telegram_status']
+    finally:
+        submitter.disconnect()
+        bystander.disconnect()
+
+
+def test_reconnecting_client_gets_the_stored_status(hub):
+    hub.report_telegram_status('job-c', None, RuntimeError('Telegram error: chat not found'))
+    client = hub.socketio.test_client(hub.app)
+    try:
+        client.emit('telegram_status', {'job_id': 'job-c'})
+        received = [message['args'][0] for message in client.get_received()
+                    if message['name'] == 'telegram_status']
+        assert received == [{'job_id': 'job-c', 'status': 'failed', 'error': 'Telegram error: chat not found'}]
+    finally:
+        client.disconnect()
@@ -0,0 +1,32 @@
+"""Timetable ingestion runs in one process at a time."""
+import time
+from datetime import timedelta
+
+
+def test_ingest_holds_the_cross_process_lock(hub, monkeypatch):
+    owners = []
+
+    def record_lock(timetable_type):
+        lock = hub.db.session.get(hub.JobLock, 'ingest_timetables')
+        owners.append((lock.owner, lock.expires_at > hub.utcnow()))
+    monkeypatch.setattr(hub, 'ingest_timetable', record_lock)
+
+    hub.ingest_timetables()
+
+    assert owners == [(hub.PROCESS_ID, True)] * len(hub.TIMETABLE_TYPES)
+    hub.db.session.expire_all()
+    assert hub.db.session.get(hub.JobLock, 'ingest_timetables').expires_at <= hub.utcnow()
+
+
+def test_ingest_waits_while_another_process_ingests(hub, monkeypatch):
+    ingested = []
+    monkeypatch.setattr(hub, 'ingest_timetable', ingested.append)
+    hub.db.session.add(hub.JobLock(name='ingest_timetables', owner='other-host:1:abcd',
+                                   expires_at=hub.utcnow() + timedelta(seconds=1)))
+    hub.db.session.commit()
+
+    started = time.monotonic()
+    hub.ingest_timetables()
+
+    assert time.monotonic() - started >= 0.5
+    assert ingested == list(hub.TIMETABLE_TYPES)
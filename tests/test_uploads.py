@@ -0,0 +1,62 @@
+"""Multipart uploads are hashed while Werkzeug writes them, and land in UPLOAD_FOLDER once."""
+import hashlib
+import io
+import os
+
+import pytest
+
+
+@pytest.fixture
+def client(hub):
+    return hub.app.test_client()
+
+
+@pytest.fixture
+def unit_id(hub):
+    unit = hub.Unit(name='Uploads')
+    hub.db.session.add(unit)
+    hub.db.session.commit()
+    return unit.id
+
+
+def folder_listing(hub):
+    return sorted(os.listdir(hub.app.config['UPLOAD_FOLDER']))
+
+
+def upload_note(client, unit_id, payload, filename='lecture.pdf'):
+    return client.post('/', data={'unit_id': str(unit_id), 'note': (io.BytesIO(payload), filename)})
+
+
+def test_note_is_stored_under_its_hash_without_a_second_copy(client, hub, unit_id, monkeypatch):
+    def copy_again(*args, **kwargs):
+        raise AssertionError('the spooled upload was copied again')
+    monkeypatch.setattr(hub, 'store_upload', copy_again)
+    payload = os.urandom(300 * 1024)
+    before = set(folder_listing(hub))
+
+    assert upload_note(client, unit_id, payload).status_code == 302
+
+    content_hash = hashlib.sha256(payload).hexdigest()
+    assert set(folder_listing(hub)) - before == {f'{content_hash}.pdf'}
+    note = hub.File.query.filter_by(unit_id=unit_id).one()
+    assert (note.content_hash, note.size) == (content_hash, len(payload))
+
+
+def test_same_bytes_twice_share_one_blob(client, hub, unit_id):
+    payload = os.urandom(64 * 1024)
+    upload_note(client, unit_id, payload, 'first.pdf')
+    before = folder_listing(hub)
+
+    assert upload_note(client, unit_id, payload, 'second.pdf').status_code == 302
+
+    assert folder_listing(hub) == before
+    assert hub.File.query.filter_by(unit_id=unit_id).count() == 2
+
+
+def test_rejected_upload_leaves_no_spool_file(client, hub, unit_id):
+    before = folder_listing(hub)
+
+    upload_note(client, unit_id, b'MZ not a note', 'tool.exe')
+
+    assert folder_listing(hub) == before
+    assert not [name for name in folder_listing(hub) if name.startswith('.upload-')]
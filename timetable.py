@@ -0,0 +1,192 @@
+"""Parse uploaded class/exam timetables into normalized session rows.
+
+Two spreadsheet layouts are understood:
+
+* long: one row per session, with columns such as Unit/Course, Day or Date,
+  Time (or Start/End) and Venue/Room;
+* grid: a Day (or Date) column followed by one column per time slot, each
+  cell naming the unit, optionally with the venue in brackets
+  ("BIT 2101 (LAB 3)").
+
+parse_timetable() returns plain dicts so the caller decides how to store them.
+"""
+import logging
+import os
+import re
+from datetime import date, datetime, time
+
+logger = logging.getLogger(__name__)
+
+DAYS = {name: index for index, name in enumerate(
+    ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'))}
+UNIT_COLUMNS = ('unit', 'course', 'subject', 'module', 'code', 'unit code', 'course code')
+DAY_COLUMNS = ('day', 'weekday')
+DATE_COLUMNS = ('date', 'exam date')
+TIME_COLUMNS = ('time', 'period', 'slot')
+START_COLUMNS = ('start', 'start time', 'from', 'begins')
+END_COLUMNS = ('end', 'end time', 'to', 'ends')
+VENUE_COLUMNS = ('venue', 'room', 'location', 'hall', 'lab')
+TIME_PATTERN = re.compile(r'(\d{1,2})[:.](\d{2})\s*([ap]\.?m\.?)?', re.IGNORECASE)
+CELL_VENUE = re.compile(r'^(.*?)\s*[(\[]\s*(.+?)\s*[)\]]\s*$')
+
+
+def normalize_unit(name):
+    return ' '.join(str(name).lower().split())
+
+
+def parse_day(value):
+    text = str(value).strip().lower()
+    for name, index in DAYS.items():
+        if text.startswith(name[:3]):
+            return index
+    return None
+
+
+def parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%y', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_times(value):
+    """Return (start, end) from '08:00', '8.00am - 10.00am', a datetime.time, etc."""
+    if isinstance(value, time):
+        return value, None
+    if isinstance(value, datetime):
+        return value.time(), None
+    found = []
+    for hour, minute, meridiem in TIME_PATTERN.findall(str(value)):
+        hour, minute = int(hour), int(minute)
+        meridiem = meridiem.lower().replace('.', '')
+        if meridiem == 'pm' and hour < 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+        if hour < 24 and minute < 60:
+            found.append(time(hour, minute))
+    if not found:
+        return None, None
+    return found[0], found[1] if len(found) > 1 else None
+
+
+def split_cell(value):
+    """'BIT 2101 (LAB 3)' -> ('BIT 2101', 'LAB 3')."""
+    text = ' '.join(str(value).split())
+    match = CELL_VENUE.match(text)
+    if match:
+        return match.group(1), match.group(2)
+    return text, None
+
+
+def find_column(columns, names):
+    for column in columns:
+        if str(column).strip().lower() in names:
+            return column
+    return None
+
+
+def is_blank(value):
+    return value is None or str(value).strip().lower() in ('', 'nan', 'nat', 'none', '-')
+
+
+def read_frames(path):
+    import pandas as pd
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return [pd.read_csv(path, dtype=object, on_bad_lines='skip')]
+    if extension in ('.xlsx', '.xls'):
+        return list(pd.read_excel(path, sheet_name=None, dtype=object).values())
+    return []
+
+
+def session(unit, day, session_date, start, end, venue):
+    if session_date is not None and day is None:
+        day = session_date.weekday()
+    return {
+        'unit': unit[:100],
+        'unit_key': normalize_unit(unit)[:100],
+        'day': day,
+        'session_date': session_date,
+        'start_time': start,
+        'end_time': end,
+        'venue': venue[:100] if venue else None,
+    }
+
+
+def parse_long(frame):
+    columns = list(frame.columns)
+    unit_col = find_column(columns, UNIT_COLUMNS)
+    day_col = find_column(columns, DAY_COLUMNS)
+    date_col = find_column(columns, DATE_COLUMNS)
+    time_col = find_column(columns, TIME_COLUMNS)
+    start_col = find_column(columns, START_COLUMNS)
+    end_col = find_column(columns, END_COLUMNS)
+    venue_col = find_column(columns, VENUE_COLUMNS)
+    if unit_col is None or (day_col is None and date_col is None) or (time_col is None and start_col is None):
+        return None
+    sessions = []
+    for row in frame.itertuples(index=False):
+        values = dict(zip(columns, row))
+        if is_blank(values[unit_col]):
+            continue
+        day = parse_day(values[day_col]) if day_col is not None and not is_blank(values[day_col]) else None
+        session_date = parse_date(values[date_col]) if date_col is not None and not is_blank(values[date_col]) else None
+        start, end = parse_times(values[time_col if time_col is not None else start_col])
+        if end is None and end_col is not None and not is_blank(values[end_col]):
+            end = parse_times(values[end_col])[0]
+        if start is None or (day is None and session_date is None):
+            continue
+        venue = None if venue_col is None or is_blank(values[venue_col]) else str(values[venue_col]).strip()
+        sessions.append(session(str(values[unit_col]).strip(), day, session_date, start, end, venue))
+    return sessions
+
+
+def parse_grid(frame):
+    columns = list(frame.columns)
+    day_col = find_column(columns, DAY_COLUMNS) or find_column(columns, DATE_COLUMNS) or columns[0]
+    slots = [(column, parse_times(column)) for column in columns if column != day_col]
+    slots = [(column, times) for column, times in slots if times[0] is not None]
+    if not slots:
+        return None
+    sessions = []
+    for row in frame.itertuples(index=False):
+        values = dict(zip(columns, row))
+        if is_blank(values[day_col]):
+            continue
+        day = parse_day(values[day_col])
+        session_date = None if day is not None else parse_date(values[day_col])
+        if day is None and session_date is None:
+            continue
+        for column, (start, end) in slots:
+            if is_blank(values[column]):
+                continue
+            unit, venue = split_cell(values[column])
+            sessions.append(session(unit, day, session_date, start, end, venue))
+    return sessions
+
+
+def parse_timetable(path):
+    """Return a list of session dicts from a .csv/.xlsx/.xls timetable ([] if unreadable)."""
+    try:
+        frames = read_frames(path)
+    except Exception as e:
+        logger.warning(f"Could not read timetable {path}: {str(e)}")
+        return []
+    sessions = []
+    for frame in frames:
+        frame = frame.dropna(how='all')
+        if frame.empty:
+            continue
+        parsed = parse_long(frame)
+        if parsed is None:
+            parsed = parse_grid(frame)
+        sessions.extend(parsed or [])
+    return sessions
@@ -0,0 +1,97 @@
+"""Content-addressed storage for uploaded notes and timetables.
+
+Uploads are written to disk while a SHA-256 is computed, then renamed to
+<sha256><ext>. Uploading the same bytes twice therefore lands on the same
+blob, and the second copy is simply discarded.
+
+HashingSpool is handed to Werkzeug's multipart parser (see UploadRequest in
+app.py), so a file part is hashed as it is written into the upload folder and
+only renamed afterwards. store_upload() does the same for any other stream.
+"""
+import hashlib
+import os
+import tempfile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def blob_name(content_hash, filename):
+    return f"{content_hash}{os.path.splitext(filename)[1].lower()}"
+
+
+def place_blob(temp_path, folder, content_hash, filename):
+    """Move a finished temp file to its content address and return the blob name."""
+    stored_name = blob_name(content_hash, filename)
+    final_path = os.path.join(folder, stored_name)
+    if os.path.exists(final_path):
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, final_path)
+    return stored_name
+
+
+class HashingSpool:
+    """Temp file in `folder` that hashes every byte written to it.
+
+    Reads and seeks go to the file, so the upload can still be parsed in place.
+    commit() keeps it as a blob; otherwise close() deletes it.
+    """
+
+    def __init__(self, folder):
+        fd, self.path = tempfile.mkstemp(dir=folder, prefix='.upload-')
+        self.file = os.fdopen(fd, 'w+b')
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.committed = False
+
+    def write(self, data):
+        self.digest.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def __iter__(self):
+        return iter(self.file)
+
+    def commit(self, folder, filename):
+        """Store the spooled bytes as a blob and return (stored_name, sha256, size)."""
+        self.file.close()
+        content_hash = self.digest.hexdigest()
+        stored_name = place_blob(self.path, folder, content_hash, filename)
+        self.committed = True
+        return stored_name, content_hash, self.size
+
+    def close(self):
+        self.file.close()
+        if not self.committed and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def store_upload(stream, folder, filename, chunk_size=CHUNK_SIZE, yield_fn=None):
+    """Write `stream` into `folder` and return (stored_name, sha256, size).
+
+    `yield_fn` is called between chunks so a cooperative server (eventlet)
+    can run other requests while a large upload is being written.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+                if yield_fn:
+                    yield_fn()
+        content_hash = digest.hexdigest()
+        return place_blob(temp_path, folder, content_hash, filename), content_hash, size
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise